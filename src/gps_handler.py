@@ -4,8 +4,20 @@ Supports GPS visualization, reverse geocoding, and location grouping.
 """
 
 from typing import Dict, Tuple, List, Optional
+from functools import lru_cache
+import logging
+import math
+import struct
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import piexif
+from PIL import Image, ExifTags
 from pathlib import Path
+from metadata_editor import MetadataEditor
+from metadata_parser import MetadataParser
+
+
+logger = logging.getLogger(__name__)
 
 
 class GPSHandler:
@@ -83,6 +95,21 @@ class GPSHandler:
         (22.3193, 114.1694): "Hong Kong",
     }
     
+    # Maximum distance (in degrees of arc) for a database match,
+    # also stored as the cosine of that central angle
+    _MATCH_RADIUS = 8.0
+    _MATCH_COS = math.cos(math.radians(_MATCH_RADIUS))
+    
+    # LOCATION_DB frozen into parallel arrays sorted by latitude, so a
+    # lookup can binary-search the latitude band around the query
+    _DB_LAT = np.array([lat for lat, _ in sorted(LOCATION_DB)], dtype=np.float64)
+    _DB_NAMES = tuple(map(LOCATION_DB.get, sorted(LOCATION_DB)))
+    
+    # Trig terms for the spherical law of cosines, computed once
+    _DB_SIN_LAT = np.sin(np.radians(_DB_LAT))
+    _DB_COS_LAT = np.cos(np.radians(_DB_LAT))
+    _DB_LON_RAD = np.radians([lon for _, lon in sorted(LOCATION_DB)])
+    
     @staticmethod
     def extract_gps_coordinates(file_path: Path) -> Optional[Tuple[float, float]]:
         """
@@ -90,55 +117,126 @@ class GPSHandler:
         Returns: (latitude, longitude) or None
         """
         try:
-            exif_dict = piexif.load(str(file_path))
-            gps_ifd = exif_dict.get("GPS", {})
-            
-            if not gps_ifd:
-                return None
-            
-            # Extract latitude
-            lat_data = gps_ifd.get(piexif.GPSIFD.GPSLatitude)
-            lat_ref = gps_ifd.get(piexif.GPSIFD.GPSLatitudeRef)
-            
-            # Extract longitude
-            lon_data = gps_ifd.get(piexif.GPSIFD.GPSLongitude)
-            lon_ref = gps_ifd.get(piexif.GPSIFD.GPSLongitudeRef)
-            
-            if not (lat_data and lon_data):
-                return None
-            
-            # Convert to decimal degrees
-            lat = GPSHandler._dms_to_decimal(lat_data)
-            lon = GPSHandler._dms_to_decimal(lon_data)
-            
-            # Apply reference direction
-            if lat_ref and lat_ref[0] == b'S':
-                lat = -lat
-            if lon_ref and lon_ref[0] == b'W':
-                lon = -lon
-            
-            return (lat, lon)
+            return GPSHandler._coords_from_ifd(GPSHandler._load_gps_ifd(file_path))
         except Exception as e:
-            print(f"Error extracting GPS: {e}")
+            logger.error("Error extracting GPS: %s", e)
             return None
     
     @staticmethod
     def extract_altitude(file_path: Path) -> Optional[float]:
         """Extract GPS altitude from image."""
         try:
-            exif_dict = piexif.load(str(file_path))
-            gps_ifd = exif_dict.get("GPS", {})
-            
-            altitude_data = gps_ifd.get(piexif.GPSIFD.GPSAltitude)
-            
-            if altitude_data:
-                # Altitude is stored as rational (numerator, denominator)
-                return float(altitude_data[0]) / float(altitude_data[1])
-            
-            return None
+            return GPSHandler._alt_from_ifd(GPSHandler._load_gps_ifd(file_path))
         except Exception as e:
-            print(f"Error extracting altitude: {e}")
+            logger.error("Error extracting altitude: %s", e)
+            return None
+    
+    @staticmethod
+    def _load_gps_ifd(file_path: Path) -> Dict:
+        """
+        Read only the GPS IFD of an image.
+        Results are cached per (path, mtime, ctime, size), so repeated reads of an
+        unchanged file are free and any rewrite invalidates the entry.
+        The returned dict is shared and must not be modified.
+        """
+        file_stat = file_path.stat()
+        return GPSHandler._read_gps_ifd(
+            str(file_path), file_stat.st_mtime_ns, file_stat.st_ctime_ns, file_stat.st_size
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _read_gps_ifd(path: str, mtime_ns: int, ctime_ns: int, size: int) -> Dict:
+        """
+        Parse the GPS IFD from disk.
+        Pillow opens the file lazily (no pixel decode) and parses just the
+        GPS sub-IFD instead of building the full EXIF dict like piexif.load.
+        """
+        file_path = Path(path)
+        
+        # Most photos carry no GPS IFD; skip opening those with Pillow
+        if not GPSHandler._has_gps_ifd(file_path):
+            return {}
+        
+        with Image.open(file_path) as image:
+            return dict(image.getexif().get_ifd(ExifTags.IFD.GPSInfo))
+    
+    @staticmethod
+    def _has_gps_ifd(file_path: Path) -> bool:
+        """
+        Check whether a JPEG's IFD0 points to a GPS IFD using only the
+        EXIF segment from the file header, without parsing any tag values.
+        Returns True whenever the answer is uncertain (non-JPEG files,
+        unusual layouts) so callers fall back to a full parse.
+        """
+        segment = MetadataParser.read_exif_segment(file_path)
+        if segment is None:
+            return True
+        if not segment:
+            return False
+        
+        return GPSHandler._tiff_has_gps_ifd(segment[6:])
+    
+    @staticmethod
+    def _tiff_has_gps_ifd(tiff: bytes) -> bool:
+        """Scan the IFD0 entries of a TIFF/EXIF block for the GPS IFD pointer."""
+        if len(tiff) < 8:
+            return True
+        
+        endian = '<' if tiff[:2] == b'II' else '>'
+        offset = struct.unpack_from(endian + 'I', tiff, 4)[0]
+        if offset + 2 > len(tiff):
+            return True
+        
+        # Each IFD entry is 12 bytes, starting with its 2-byte tag
+        count = struct.unpack_from(endian + 'H', tiff, offset)[0]
+        for entry in range(offset + 2, offset + 2 + 12 * count, 12):
+            if entry + 2 > len(tiff):
+                return True
+            if struct.unpack_from(endian + 'H', tiff, entry)[0] == ExifTags.IFD.GPSInfo:
+                return True
+        
+        return False
+    
+    @staticmethod
+    def _coords_from_ifd(gps_ifd: Dict) -> Optional[Tuple[float, float]]:
+        """Read (latitude, longitude) from an already loaded GPS IFD."""
+        if not gps_ifd:
+            return None
+        
+        # Extract latitude
+        lat_data = gps_ifd.get(piexif.GPSIFD.GPSLatitude)
+        lat_ref = gps_ifd.get(piexif.GPSIFD.GPSLatitudeRef)
+        
+        # Extract longitude
+        lon_data = gps_ifd.get(piexif.GPSIFD.GPSLongitude)
+        lon_ref = gps_ifd.get(piexif.GPSIFD.GPSLongitudeRef)
+        
+        if not (lat_data and lon_data):
             return None
+        
+        # Convert to decimal degrees
+        lat = GPSHandler._dms_to_decimal(lat_data)
+        lon = GPSHandler._dms_to_decimal(lon_data)
+        
+        # Apply reference direction
+        if lat_ref == 'S':
+            lat = -lat
+        if lon_ref == 'W':
+            lon = -lon
+        
+        return (lat, lon)
+    
+    @staticmethod
+    def _alt_from_ifd(gps_ifd: Dict) -> Optional[float]:
+        """Read the altitude from an already loaded GPS IFD."""
+        altitude_data = gps_ifd.get(piexif.GPSIFD.GPSAltitude)
+        
+        if altitude_data is not None:
+            # Altitude is stored as a rational
+            return float(altitude_data)
+        
+        return None
     
     @staticmethod
     def reverse_geocode(latitude: float, longitude: float) -> str:
@@ -147,22 +245,37 @@ class GPSHandler:
         Matches coordinates with closest location in database.
         In production, use proper API like Google Maps or Open Street Map.
         """
-        closest_location = "Unknown Location"
-        closest_distance = float('inf')
+        # Round to ~100m so photos from the same spot share a cache entry
+        location_name = GPSHandler._nearest_location(round(latitude, 3), round(longitude, 3))
+        if location_name is not None:
+            return location_name
         
-        for (db_lat, db_lon), location_name in GPSHandler.LOCATION_DB.items():
-            # Simple Euclidean distance
-            distance = ((latitude - db_lat) ** 2 + (longitude - db_lon) ** 2) ** 0.5
-            
-            if distance < closest_distance:
-                closest_distance = distance
-                closest_location = location_name
+        return f"Coordinates: {latitude:.4f}°, {longitude:.4f}°"
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _nearest_location(latitude: float, longitude: float) -> Optional[str]:
+        """Find the closest database location name, or None if none is near."""
+        radius = GPSHandler._MATCH_RADIUS
         
-        # Only return if reasonably close (within ~8 degrees for better coverage)
-        if closest_distance < 8:
-            return closest_location
+        # Only locations within the radius in latitude can be a match
+        lo, hi = np.searchsorted(GPSHandler._DB_LAT, (latitude - radius, latitude + radius))
         
-        return f"Coordinates: {latitude:.4f}°, {longitude:.4f}°"
+        if lo < hi:
+            lat_rad = math.radians(latitude)
+            
+            # Cosine of the central angle to each candidate; the largest
+            # cosine is the smallest great-circle distance
+            cos_c = (math.sin(lat_rad) * GPSHandler._DB_SIN_LAT[lo:hi]
+                     + math.cos(lat_rad) * GPSHandler._DB_COS_LAT[lo:hi]
+                     * np.cos(GPSHandler._DB_LON_RAD[lo:hi] - math.radians(longitude)))
+            i = int(cos_c.argmax())
+            
+            # Only return if reasonably close (within ~8 degrees for better coverage)
+            if cos_c[i] > GPSHandler._MATCH_COS:
+                return GPSHandler._DB_NAMES[lo + i]
+        
+        return None
     
     @staticmethod
     def set_gps_coordinates(file_path: Path, latitude: float, longitude: float, 
@@ -208,14 +321,11 @@ class GPSHandler:
                 gps_ifd[piexif.GPSIFD.GPSAltitude] = (int(altitude * 100), 100)
             
             # Save the image with new EXIF data
-            exif_bytes = piexif.dump(exif_dict)
-            from PIL import Image
-            image = Image.open(file_path)
-            image.save(file_path, exif=exif_bytes)
+            MetadataEditor.write_exif(file_path, piexif.dump(exif_dict))
             
             return True
         except Exception as e:
-            print(f"Error setting GPS: {e}")
+            logger.error("Error setting GPS: %s", e)
             return False
     
     @staticmethod
@@ -227,21 +337,24 @@ class GPSHandler:
             if "GPS" in exif_dict:
                 exif_dict["GPS"] = {}
             
-            exif_bytes = piexif.dump(exif_dict)
-            from PIL import Image
-            image = Image.open(file_path)
-            image.save(file_path, exif=exif_bytes)
+            MetadataEditor.write_exif(file_path, piexif.dump(exif_dict))
             
             return True
         except Exception as e:
-            print(f"Error removing GPS data: {e}")
+            logger.error("Error removing GPS data: %s", e)
             return False
     
     @staticmethod
     def get_gps_info(file_path: Path) -> Dict:
         """Get complete GPS information from image."""
-        coords = GPSHandler.extract_gps_coordinates(file_path)
-        altitude = GPSHandler.extract_altitude(file_path)
+        # Load the GPS IFD once and read both values from it
+        try:
+            gps_ifd = GPSHandler._load_gps_ifd(file_path)
+            coords = GPSHandler._coords_from_ifd(gps_ifd)
+            altitude = GPSHandler._alt_from_ifd(gps_ifd)
+        except Exception as e:
+            logger.error("Error reading GPS info: %s", e)
+            coords, altitude = None, None
         
         info = {
             'has_gps': coords is not None,
@@ -262,9 +375,15 @@ class GPSHandler:
     def group_images_by_location(image_files: List[Path], radius_km: float = 1.0) -> Dict[str, List[Path]]:
         """Group images by location (within radius)."""
         location_groups = {}
+        # Iterated twice below, so a generator must not be used up by the first pass
+        image_files = list(image_files)
         
-        for image_file in image_files:
-            coords = GPSHandler.extract_gps_coordinates(image_file)
+        # EXIF reads are I/O bound, so fetch coordinates concurrently;
+        # reverse geocoding is cheap and stays on this thread
+        with ThreadPoolExecutor() as executor:
+            all_coords = list(executor.map(GPSHandler.extract_gps_coordinates, image_files))
+        
+        for image_file, coords in zip(image_files, all_coords):
             if not coords:
                 continue
             
@@ -280,10 +399,5 @@ class GPSHandler:
     @staticmethod
     def _dms_to_decimal(dms_data) -> float:
         """Convert DMS (Degrees, Minutes, Seconds) to decimal degrees."""
-        try:
-            degrees = dms_data[0][0] / dms_data[0][1]
-            minutes = dms_data[1][0] / dms_data[1][1] / 60
-            seconds = dms_data[2][0] / dms_data[2][1] / 3600
-            return degrees + minutes + seconds
-        except Exception:
-            return 0.0
+        degrees, minutes, seconds = dms_data
+        return float(degrees) + (float(minutes) + float(seconds) / 60.0) / 60.0
@@ -3,11 +3,18 @@ Advanced image operations for batch processing.
 Supports resize, compress, format conversion, and more.
 """
 
+import logging
+import os
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from PIL import Image
 from typing import Dict, List, Tuple, Optional
 
 
+logger = logging.getLogger(__name__)
+
+
 class ImageOperations:
     """Advanced image processing operations."""
     
@@ -22,6 +29,9 @@ class ImageOperations:
         '.ico': 'ICO'
     }
     
+    # Extension lookup used when scanning directories
+    _SUPPORTED_EXTENSIONS = frozenset(SUPPORTED_FORMATS)
+    
     @staticmethod
     def resize_image(file_path: Path, width: int, height: int, 
                     maintain_aspect: bool = True, output_path: Optional[Path] = None) -> bool:
@@ -41,13 +51,13 @@ class ImageOperations:
             if maintain_aspect:
                 image.thumbnail((width, height), Image.Resampling.LANCZOS)
             else:
-                image = image.resize((width, height), Image.Resampling.LANCZOS)
+                image = image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=2.0)
             
             save_path = output_path or file_path
             image.save(save_path, quality=95)
             return True
         except Exception as e:
-            print(f"Error resizing image: {e}")
+            logger.error("Error resizing image: %s", e)
             return False
     
     @staticmethod
@@ -68,7 +78,7 @@ class ImageOperations:
             image.save(save_path, quality=quality, optimize=True)
             return True
         except Exception as e:
-            print(f"Error compressing image: {e}")
+            logger.error("Error compressing image: %s", e)
             return False
     
     @staticmethod
@@ -85,11 +95,7 @@ class ImageOperations:
         try:
             image = Image.open(file_path)
             
-            # Convert RGBA to RGB for JPEG
-            if target_format.lower() == 'jpg' and image.mode == 'RGBA':
-                rgb_image = Image.new('RGB', image.size, (255, 255, 255))
-                rgb_image.paste(image, mask=image.split()[3])
-                image = rgb_image
+            image = ImageOperations._prepare_for_format(image, target_format)
             
             if output_path is None:
                 output_path = file_path.parent / f"{file_path.stem}.{target_format}"
@@ -97,9 +103,110 @@ class ImageOperations:
             image.save(output_path)
             return True
         except Exception as e:
-            print(f"Error converting format: {e}")
+            logger.error("Error converting format: %s", e)
             return False
     
+    @staticmethod
+    def _prepare_for_format(image: Image.Image, target_format: str) -> Image.Image:
+        """Convert RGBA to RGB on a white background when targeting JPEG."""
+        if target_format.lower() == 'jpg' and image.mode == 'RGBA':
+            rgb_image = Image.new('RGB', image.size, (255, 255, 255))
+            rgb_image.paste(image, mask=image.split()[3])
+            return rgb_image
+        return image
+    
+    @staticmethod
+    def process_pipeline(file_path: Path, operations: List[Tuple[str, Dict]],
+                         output_path: Optional[Path] = None) -> bool:
+        """
+        Apply several operations to an image with a single decode and save.
+        
+        Args:
+            file_path: Input image path
+            operations: (name, options) pairs applied in order, e.g.
+                ('resize', {'width': 800, 'height': 600, 'maintain_aspect': True}),
+                ('compress', {'quality': 85}),
+                ('convert', {'format': 'png'})
+            output_path: Output file path (defaults to input, or the input
+                stem with the new extension when converting)
+        """
+        try:
+            image = Image.open(file_path)
+            image, save_options, target_format = ImageOperations._apply_ops(image, operations)
+            
+            if output_path is None:
+                if target_format:
+                    output_path = file_path.parent / f"{file_path.stem}.{target_format}"
+                else:
+                    output_path = file_path
+            
+            image.save(output_path, **save_options)
+            return True
+        except Exception as e:
+            logger.error("Error processing image: %s", e)
+            return False
+    
+    @staticmethod
+    def _apply_ops(image: Image.Image,
+                   operations: List[Tuple[str, Dict]]) -> Tuple[Image.Image, Dict, Optional[str]]:
+        """
+        Apply pipeline operations to an in-memory image.
+        Returns: (image, save options, target format or None)
+        """
+        save_options = {}
+        target_format = None
+        
+        for name, options in operations:
+            if name == 'resize':
+                size = (options['width'], options['height'])
+                if options.get('maintain_aspect', True):
+                    image.thumbnail(size, Image.Resampling.LANCZOS)
+                else:
+                    image = image.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+                save_options.setdefault('quality', 95)
+            elif name == 'compress':
+                save_options['quality'] = options.get('quality', 85)
+                save_options['optimize'] = True
+            elif name == 'convert':
+                target_format = options['format']
+                image = ImageOperations._prepare_for_format(image, target_format)
+            else:
+                raise ValueError(f"Unknown operation: {name}")
+        
+        return image, save_options, target_format
+    
+    @staticmethod
+    def _scan_images(directory: Path) -> List[Tuple[Path, int]]:
+        """List supported image files in a directory with their sizes."""
+        images = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # Cheap suffix check first; DirEntry caches the stat result
+                if os.path.splitext(entry.name)[1].lower() not in ImageOperations._SUPPORTED_EXTENSIONS:
+                    continue
+                if entry.is_file():
+                    images.append((Path(entry.path), entry.stat().st_size))
+        return images
+    
+    @staticmethod
+    def _unique_output_paths(output_paths: List[Path]) -> List[Path]:
+        """
+        Make batch output paths distinct, so no two worker threads write the same file.
+        e.g. a.jpg and a.png converted to png give a.png and a_2.png. Names are
+        compared case-insensitively for case-insensitive filesystems.
+        """
+        used = set()
+        unique_paths = []
+        for path in output_paths:
+            candidate = path
+            counter = 2
+            while candidate.name.lower() in used:
+                candidate = path.with_name(f"{path.stem}_{counter}{path.suffix}")
+                counter += 1
+            used.add(candidate.name.lower())
+            unique_paths.append(candidate)
+        return unique_paths
+    
     @staticmethod
     def batch_resize(directory: Path, width: int, height: int, 
                     output_dir: Optional[Path] = None) -> Dict:
@@ -118,21 +225,26 @@ class ImageOperations:
             output_dir = output_dir or directory / 'resized'
             output_dir.mkdir(exist_ok=True)
             
-            for image_file in directory.glob('*'):
-                if image_file.suffix.lower() in ImageOperations.SUPPORTED_FORMATS:
-                    stats['total'] += 1
-                    original_size = image_file.stat().st_size
-                    
-                    output_path = output_dir / image_file.name
-                    
-                    if ImageOperations.resize_image(image_file, width, height, True, output_path):
+            image_files = ImageOperations._scan_images(directory)
+            stats['total'] = len(image_files)
+            
+            # Pillow releases the GIL while decoding/encoding, so threads
+            # process several images in parallel
+            with ThreadPoolExecutor() as executor:
+                results = executor.map(
+                    lambda item: ImageOperations.resize_image(item[0], width, height, True, output_dir / item[0].name),
+                    image_files
+                )
+                
+                for (image_file, original_size), success in zip(image_files, results):
+                    if success:
                         stats['successful'] += 1
                         stats['total_original_size'] += original_size
-                        stats['total_new_size'] += output_path.stat().st_size
+                        stats['total_new_size'] += (output_dir / image_file.name).stat().st_size
                     else:
                         stats['failed'] += 1
         except Exception as e:
-            print(f"Error in batch resize: {e}")
+            logger.error("Error in batch resize: %s", e)
         
         return stats
     
@@ -155,17 +267,20 @@ class ImageOperations:
             output_dir = output_dir or directory / 'compressed'
             output_dir.mkdir(exist_ok=True)
             
-            for image_file in directory.glob('*'):
-                if image_file.suffix.lower() in ImageOperations.SUPPORTED_FORMATS:
-                    stats['total'] += 1
-                    original_size = image_file.stat().st_size
-                    
-                    output_path = output_dir / image_file.name
-                    
-                    if ImageOperations.compress_image(image_file, quality, output_path):
+            image_files = ImageOperations._scan_images(directory)
+            stats['total'] = len(image_files)
+            
+            with ThreadPoolExecutor() as executor:
+                results = executor.map(
+                    lambda item: ImageOperations.compress_image(item[0], quality, output_dir / item[0].name),
+                    image_files
+                )
+                
+                for (image_file, original_size), success in zip(image_files, results):
+                    if success:
                         stats['successful'] += 1
                         stats['total_original_size'] += original_size
-                        stats['total_new_size'] += output_path.stat().st_size
+                        stats['total_new_size'] += (output_dir / image_file.name).stat().st_size
                     else:
                         stats['failed'] += 1
             
@@ -175,7 +290,7 @@ class ImageOperations:
                     stats['total_original_size'] * 100
                 )
         except Exception as e:
-            print(f"Error in batch compress: {e}")
+            logger.error("Error in batch compress: %s", e)
         
         return stats
     
@@ -196,44 +311,114 @@ class ImageOperations:
             output_dir = output_dir or directory / f'converted_{target_format}'
             output_dir.mkdir(exist_ok=True)
             
-            for image_file in directory.glob('*'):
-                if image_file.suffix.lower() in ImageOperations.SUPPORTED_FORMATS:
-                    stats['total'] += 1
-                    
-                    output_path = output_dir / f"{image_file.stem}.{target_format}"
-                    
-                    if ImageOperations.convert_format(image_file, target_format, output_path):
+            image_files = [path for path, _ in ImageOperations._scan_images(directory)]
+            stats['total'] = len(image_files)
+            output_paths = ImageOperations._unique_output_paths(
+                [output_dir / f"{f.stem}.{target_format}" for f in image_files]
+            )
+            
+            with ThreadPoolExecutor() as executor:
+                results = executor.map(
+                    lambda f, out: ImageOperations.convert_format(f, target_format, out),
+                    image_files, output_paths
+                )
+                
+                for image_file, success in zip(image_files, results):
+                    if success:
                         stats['successful'] += 1
                     else:
                         stats['failed'] += 1
                         stats['errors'].append(str(image_file))
         except Exception as e:
-            print(f"Error in batch convert: {e}")
+            logger.error("Error in batch convert: %s", e)
         
         return stats
     
     @staticmethod
-    def get_image_info(file_path: Path) -> Dict:
-        """Get comprehensive image information."""
+    def batch_process(directory: Path, operations: List[Tuple[str, Dict]],
+                      output_dir: Optional[Path] = None) -> Dict:
+        """
+        Run an operation pipeline over all images in a directory,
+        decoding and saving each image only once.
+        """
+        stats = {
+            'total': 0,
+            'successful': 0,
+            'failed': 0,
+            'errors': []
+        }
+        
         try:
-            image = Image.open(file_path)
-            file_stat = file_path.stat()
+            output_dir = output_dir or directory / 'processed'
+            output_dir.mkdir(exist_ok=True)
             
+            target_format = next(
+                (options['format'] for name, options in operations if name == 'convert'), None
+            )
+            
+            def output_path_for(image_file: Path) -> Path:
+                if target_format:
+                    return output_dir / f"{image_file.stem}.{target_format}"
+                return output_dir / image_file.name
+            
+            image_files = [path for path, _ in ImageOperations._scan_images(directory)]
+            stats['total'] = len(image_files)
+            output_paths = ImageOperations._unique_output_paths(
+                [output_path_for(f) for f in image_files]
+            )
+            
+            with ThreadPoolExecutor() as executor:
+                results = executor.map(
+                    lambda f, out: ImageOperations.process_pipeline(f, operations, out),
+                    image_files, output_paths
+                )
+                
+                for image_file, success in zip(image_files, results):
+                    if success:
+                        stats['successful'] += 1
+                    else:
+                        stats['failed'] += 1
+                        stats['errors'].append(str(image_file))
+        except Exception as e:
+            logger.error("Error in batch processing: %s", e)
+        
+        return stats
+    
+    @staticmethod
+    def get_image_info(file_path: Path, file_stat: Optional[os.stat_result] = None) -> Dict:
+        """
+        Get comprehensive image information.
+        Results are cached per (path, mtime, ctime, size), so the info and
+        image-operation dialogs open the file once between edits.
+        """
+        try:
+            if file_stat is None:
+                file_stat = file_path.stat()
+            return dict(ImageOperations._image_info_cached(
+                str(file_path), file_stat.st_mtime_ns, file_stat.st_ctime_ns, file_stat.st_size
+            ))
+        except Exception as e:
+            logger.error("Error getting image info: %s", e)
+            return {}
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _image_info_cached(path: str, mtime_ns: int, ctime_ns: int, size: int) -> Dict:
+        """Read image info from disk; only called on a cache miss."""
+        with Image.open(path) as image:
+            n_frames = getattr(image, 'n_frames', 1)
             return {
-                'filename': file_path.name,
+                'filename': Path(path).name,
                 'format': image.format,
                 'mode': image.mode,
                 'width': image.width,
                 'height': image.height,
-                'size_bytes': file_stat.st_size,
-                'size_mb': file_stat.st_size / (1024 * 1024),
+                'size_bytes': size,
+                'size_mb': size / (1024 * 1024),
                 'dpi': image.info.get('dpi', (72, 72)),
-                'has_animation': hasattr(image, 'n_frames') and image.n_frames > 1,
-                'frame_count': getattr(image, 'n_frames', 1)
+                'has_animation': n_frames > 1,
+                'frame_count': n_frames
             }
-        except Exception as e:
-            print(f"Error getting image info: {e}")
-            return {}
     
     @staticmethod
     def create_thumbnail(file_path: Path, thumb_size: Tuple[int, int] = (150, 150),
@@ -247,5 +432,5 @@ class ImageOperations:
             image.save(save_path)
             return True
         except Exception as e:
-            print(f"Error creating thumbnail: {e}")
+            logger.error("Error creating thumbnail: %s", e)
             return False
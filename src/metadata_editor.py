@@ -7,13 +7,20 @@ Supports comprehensive EXIF fields and file timestamp modification.
 from pathlib import Path
 from PIL import Image
 import piexif
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+from metadata_parser import MetadataParser
 import shutil
 from datetime import datetime
+import json
+import logging
 import os
+import subprocess
 import time
 
 
+logger = logging.getLogger(__name__)
+
+
 class MetadataEditor:
     """Edit and export image metadata with comprehensive field support."""
 
@@ -71,6 +78,18 @@ class MetadataEditor:
         "UserComment": ("Exif", piexif.ExifIFD.UserComment),
     }
 
+    # Formats whose EXIF piexif.insert can replace without re-encoding
+    EXIF_INSERT_FORMATS = {'.jpg', '.jpeg', '.webp'}
+
+    # exiftool names for the fields above where they differ from piexif's
+    EXIFTOOL_TAG_NAMES = {
+        "DateTime": "ModifyDate",
+        "DateTimeDigitized": "CreateDate",
+        "ISOSpeedRatings": "ISO",
+        "ExposureBiasValue": "ExposureCompensation",
+        "FocalLengthIn35mmFilm": "FocalLengthIn35mmFormat",
+    }
+
     @staticmethod
     def edit_exif_data(file_path: Path, exif_updates: Dict) -> bool:
         """
@@ -84,46 +103,152 @@ class MetadataEditor:
             True if successful, False otherwise
         """
         try:
-            # Load existing EXIF data
-            exif_dict = piexif.load(str(file_path))
+            # Load existing EXIF data (shared with the parser's cache)
+            exif_dict = MetadataParser.load_exif(file_path)
             
-            # Update EXIF data
+            # Group the updates by IFD, then apply each group in one go
+            updates_by_ifd = {}
+            field_mapping = MetadataEditor.EXIF_FIELD_MAPPING
             for key, value in exif_updates.items():
-                if key not in MetadataEditor.EXIF_FIELD_MAPPING:
-                    continue
-                
-                mapping = MetadataEditor.EXIF_FIELD_MAPPING[key]
-                ifd_name, tag = mapping[0], mapping[1]
-                
+                ifd_name, tag = field_mapping.get(key, (None, None))
                 if tag is None:
                     continue
                 
-                try:
-                    # Convert string to appropriate format
-                    if isinstance(value, str):
-                        value = value.encode('utf-8')
-                    
-                    # Ensure IFD exists
-                    if ifd_name not in exif_dict or exif_dict[ifd_name] is None:
-                        exif_dict[ifd_name] = {}
-                    
-                    exif_dict[ifd_name][tag] = value
-                except Exception as e:
-                    print(f"Error setting {key}: {e}")
-                    continue
+                # Convert string to appropriate format
+                if isinstance(value, str):
+                    value = value.encode('utf-8')
+                
+                updates_by_ifd.setdefault(ifd_name, {})[tag] = value
+            
+            for ifd_name, updates in updates_by_ifd.items():
+                # Ensure IFD exists
+                if exif_dict.get(ifd_name) is None:
+                    exif_dict[ifd_name] = {}
+                exif_dict[ifd_name].update(updates)
             
             # Convert EXIF dict back to bytes
             exif_bytes = piexif.dump(exif_dict)
             
             # Save image with new EXIF data
-            image = Image.open(file_path)
-            image.save(file_path, exif=exif_bytes)
+            MetadataEditor.write_exif(file_path, exif_bytes)
             
             return True
         except Exception as e:
-            print(f"Error editing EXIF data: {e}")
+            logger.error("Error editing EXIF data: %s", e)
             return False
     
+    @staticmethod
+    def write_exif(file_path: Path, exif_bytes: bytes):
+        """
+        Write EXIF bytes back to an image file.
+        JPEG and WebP get the EXIF segment spliced in with piexif.insert, so
+        pixel data is not decoded or re-compressed; other formats are re-saved.
+        """
+        if file_path.suffix.lower() in MetadataEditor.EXIF_INSERT_FORMATS:
+            piexif.insert(exif_bytes, str(file_path))
+        else:
+            with Image.open(file_path) as image:
+                image.save(file_path, exif=exif_bytes)
+    
+    @staticmethod
+    def batch_edit(files_and_updates: Dict[Path, Dict], backend: str = 'exiftool') -> Dict[Path, bool]:
+        """
+        Edit EXIF data in many image files.
+        
+        With the exiftool backend every file is piped through one long-lived
+        `exiftool -stay_open` process, which patches the files in place
+        without a per-file load/dump round trip. If exiftool is not installed
+        (or backend is 'piexif'), each file goes through edit_exif_data.
+        
+        Args:
+            files_and_updates: Dictionary mapping image paths to EXIF tag updates
+            backend: 'exiftool' or 'piexif'
+            
+        Returns:
+            Dictionary mapping each image path to True if successful
+        """
+        results = {}
+        exiftool = shutil.which('exiftool') if backend == 'exiftool' else None
+        process = None
+        if exiftool:
+            try:
+                process = subprocess.Popen(
+                    [exiftool, '-stay_open', 'True', '-@', '-'],
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT, text=True, encoding='utf-8'
+                )
+            except OSError as e:
+                logger.error("Error starting exiftool: %s", e)
+        
+        items = list(files_and_updates.items())
+        try:
+            for index, (file_path, updates) in enumerate(items):
+                args = MetadataEditor._exiftool_args(file_path, updates) if process else None
+                if args is None:
+                    results[file_path] = MetadataEditor.edit_exif_data(file_path, updates)
+                    continue
+                
+                try:
+                    process.stdin.write('\n'.join(args) + f'\n-execute{index}\n')
+                    process.stdin.flush()
+                except OSError as e:
+                    # exiftool exited (BrokenPipeError): nothing after this point was written
+                    logger.error("exiftool stopped during batch edit: %s", e)
+                    for remaining_path, _ in items[index:]:
+                        results[remaining_path] = False
+                    break
+                
+                # Collect this file's output up to its {readyN} marker
+                output = []
+                ready = f'{{ready{index}}}'
+                for line in process.stdout:
+                    if line.strip() == ready:
+                        break
+                    output.append(line.strip())
+                
+                results[file_path] = '1 image files updated' in output
+                if not results[file_path]:
+                    logger.error("Error editing EXIF data in %s: %s", file_path, ' '.join(output))
+        finally:
+            if process:
+                try:
+                    process.stdin.write('-stay_open\nFalse\n')
+                    process.stdin.close()
+                    process.wait(timeout=10)
+                except (OSError, subprocess.TimeoutExpired):
+                    process.kill()
+        
+        return results
+
+    @staticmethod
+    def _exiftool_args(file_path: Path, exif_updates: Dict) -> Optional[List[str]]:
+        """
+        Build the exiftool argument lines for one file, or None if the
+        updates hold values that cannot be passed as an argument line.
+        """
+        args = ['-overwrite_original']
+        for key, value in exif_updates.items():
+            if key not in MetadataEditor.EXIF_FIELD_MAPPING:
+                continue
+            if isinstance(value, bytes):
+                value = value.decode('utf-8', errors='ignore')
+            elif isinstance(value, (int, float)):
+                value = str(value)
+            elif not isinstance(value, str):
+                return None
+            if '\n' in value:
+                return None
+            
+            tag = MetadataEditor.EXIFTOOL_TAG_NAMES.get(key, key)
+            args.append(f'-EXIF:{tag}={value}')
+        
+        # Absolute, so a name starting with '-' is never read as an option
+        path_arg = str(Path(file_path).absolute())
+        if '\n' in path_arg:
+            return None
+        args.append(path_arg)
+        return args
+
     @staticmethod
     def set_file_timestamp(file_path: Path, datetime_str: str) -> bool:
         """
@@ -147,7 +272,7 @@ class MetadataEditor:
             os.utime(file_path, (timestamp, timestamp))
             return True
         except Exception as e:
-            print(f"Error setting file timestamp: {e}")
+            logger.error("Error setting file timestamp: %s", e)
             return False
     
     @staticmethod
@@ -166,7 +291,7 @@ class MetadataEditor:
             dt = datetime.fromtimestamp(mod_time)
             return dt.strftime('%Y-%m-%d %H:%M:%S')
         except Exception as e:
-            print(f"Error getting file timestamp: {e}")
+            logger.error("Error getting file timestamp: %s", e)
             return ""
 
     @staticmethod
@@ -182,10 +307,10 @@ class MetadataEditor:
         """
         try:
             backup_path = file_path.parent / f"{file_path.stem}_backup{file_path.suffix}"
-            shutil.copy2(file_path, backup_path)
+            MetadataEditor._fast_copy(file_path, backup_path)
             return backup_path
         except Exception as e:
-            print(f"Error creating backup: {e}")
+            logger.error("Error creating backup: %s", e)
             return None
 
     @staticmethod
@@ -201,12 +326,45 @@ class MetadataEditor:
             True if successful, False otherwise
         """
         try:
-            shutil.copy2(backup_path, original_path)
+            MetadataEditor._fast_copy(backup_path, original_path)
             return True
         except Exception as e:
-            print(f"Error restoring backup: {e}")
+            logger.error("Error restoring backup: %s", e)
             return False
 
+    @staticmethod
+    def _fast_copy(src: Path, dst: Path):
+        """
+        Copy a file together with its timestamps and permissions.
+        os.copy_file_range lets the kernel copy the data, or just share the
+        extents on reflink-capable filesystems (btrfs, XFS); where it is
+        unavailable or unsupported, fall back to shutil.copy2.
+        """
+        copy_file_range = getattr(os, 'copy_file_range', None)
+        if copy_file_range is not None:
+            if dst.exists() and src.samefile(dst):
+                raise shutil.SameFileError(f"{src} and {dst} are the same file")
+            
+            try:
+                with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                    src_size = os.fstat(fsrc.fileno()).st_size
+                    remaining = src_size
+                    while remaining > 0:
+                        copied = copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                        if copied == 0:
+                            # Some FUSE/NFS/overlay mounts stop early; never keep a short copy
+                            raise OSError(f"copy_file_range stopped with {remaining} bytes left")
+                        remaining -= copied
+                    if os.fstat(fdst.fileno()).st_size != src_size:
+                        raise OSError(f"copy of {src} is incomplete")
+                shutil.copystat(src, dst)
+                return
+            except OSError:
+                # e.g. EXDEV or ENOTSUP: copy through userspace instead
+                pass
+        
+        shutil.copy2(src, dst)
+
     @staticmethod
     def export_metadata_to_file(file_path: Path, metadata: Dict, export_path: Path) -> bool:
         """
@@ -221,23 +379,36 @@ class MetadataEditor:
             True if successful, False otherwise
         """
         try:
+            if export_path.suffix.lower() == '.json':
+                document = {
+                    'file': file_path.name,
+                    'exported': datetime.now().isoformat(timespec='seconds'),
+                    'metadata': metadata,
+                }
+                with open(export_path, 'w', encoding='utf-8') as f:
+                    f.write(json.dumps(document, indent=2, ensure_ascii=False, default=str))
+                return True
+            
+            parts = [
+                f"Metadata Export for: {file_path.name}\n",
+                f"Export Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+                "=" * 80 + "\n\n",
+            ]
+            
+            for section, data in metadata.items():
+                parts.append(f"\n[{section}]\n")
+                parts.append("-" * 80 + "\n")
+                if isinstance(data, dict):
+                    parts.extend(f"{key}: {value}\n" for key, value in data.items())
+                else:
+                    parts.append(f"{data}\n")
+            
             with open(export_path, 'w', encoding='utf-8') as f:
-                f.write(f"Metadata Export for: {file_path.name}\n")
-                f.write(f"Export Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("=" * 80 + "\n\n")
-                
-                for section, data in metadata.items():
-                    f.write(f"\n[{section}]\n")
-                    f.write("-" * 80 + "\n")
-                    if isinstance(data, dict):
-                        for key, value in data.items():
-                            f.write(f"{key}: {value}\n")
-                    else:
-                        f.write(f"{data}\n")
-                
+                f.write(''.join(parts))
+            
             return True
         except Exception as e:
-            print(f"Error exporting metadata: {e}")
+            logger.error("Error exporting metadata: %s", e)
             return False
 
     @staticmethod
@@ -253,10 +424,10 @@ class MetadataEditor:
             True if successful, False otherwise
         """
         try:
-            shutil.copy2(file_path, export_path)
+            MetadataEditor._fast_copy(file_path, export_path)
             return True
         except Exception as e:
-            print(f"Error exporting image: {e}")
+            logger.error("Error exporting image: %s", e)
             return False
 
     @staticmethod
@@ -272,21 +443,67 @@ class MetadataEditor:
             True if successful, False otherwise
         """
         try:
-            image = Image.open(file_path)
+            if (file_path.suffix.lower() in ('.jpg', '.jpeg')
+                    and export_path.suffix.lower() in ('.jpg', '.jpeg')
+                    and MetadataEditor._strip_jpeg_metadata(file_path, export_path)):
+                return True
             
-            # Create a copy without EXIF data
-            data = list(image.getdata())
-            image_without_exif = Image.new(image.mode, image.size)
-            image_without_exif.putdata(data)
+            with Image.open(file_path) as image:
+                # Copy the decoded pixel buffer into a plain image; this drops the
+                # format-specific tag directories without per-pixel Python work
+                image_without_exif = image.copy()
             
-            # Copy basic properties
-            if hasattr(image, 'info'):
-                for key in ('duration', 'loop'):
-                    if key in image.info:
-                        image_without_exif.info[key] = image.info[key]
+            # Keep only animation timing and the colour profile
+            image_without_exif.info = {
+                key: value for key, value in image_without_exif.info.items()
+                if key in ('duration', 'loop', 'icc_profile')
+            }
             
             image_without_exif.save(export_path)
             return True
         except Exception as e:
-            print(f"Error removing EXIF data: {e}")
+            logger.error("Error removing EXIF data: %s", e)
             return False
+
+    @staticmethod
+    def _strip_jpeg_metadata(file_path: Path, export_path: Path) -> bool:
+        """
+        Copy a JPEG without its EXIF/XMP (APP1), IPTC (APP13) and comment
+        segments, leaving the compressed image data untouched.
+        Only the first image is kept: anything after its EOI (further MPO
+        frames with their own EXIF, maker trailers) and the APP2 MPF index
+        pointing at it are dropped, as Pillow's re-save would.
+        Returns False if the header could not be parsed.
+        """
+        data = file_path.read_bytes()
+        if data[:2] != b'\xff\xd8':
+            return False
+        
+        parts = [data[:2]]
+        pos = 2
+        while True:
+            if pos + 4 > len(data) or data[pos] != 0xFF:
+                return False
+            
+            marker = data[pos + 1]
+            if marker == 0xFF:
+                # Fill byte before a marker
+                pos += 1
+                continue
+            if marker == 0xDA:
+                # Start of scan: image data up to the first EOI; byte stuffing
+                # means FF D9 cannot occur inside the entropy-coded data
+                eoi = data.find(b'\xff\xd9', pos)
+                if eoi < 0:
+                    return False
+                parts.append(data[pos:eoi + 2])
+                break
+            
+            length = int.from_bytes(data[pos + 2:pos + 4], 'big')
+            is_mpf = marker == 0xE2 and data[pos + 4:pos + 8] == b'MPF\x00'
+            if marker not in (0xE1, 0xED, 0xFE) and not is_mpf:
+                parts.append(data[pos:pos + 2 + length])
+            pos += 2 + length
+        
+        export_path.write_bytes(b''.join(parts))
+        return True
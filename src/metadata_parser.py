@@ -7,9 +7,12 @@ from pathlib import Path
 from PIL import Image
 from PIL.ExifTags import TAGS
 import piexif
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import os
 import struct
+import time
 
 
 class MetadataParser:
@@ -21,37 +24,217 @@ class MetadataParser:
         '.webp', '.ico', '.ppm', '.pgm', '.pbm', '.pnm'
     }
 
+    # Extension lookup used when scanning directories
+    _SUPPORTED_EXTENSIONS = frozenset(SUPPORTED_FORMATS)
+
+    # Formats that can carry EXIF data (GIF, BMP, ICO and PNM cannot)
+    EXIF_CAPABLE_FORMATS = {'.jpg', '.jpeg', '.png', '.tiff', '.tif', '.webp'}
+
+    # Header bytes scanned for a JPEG's EXIF segment (APP1 is at most 64 KiB)
+    EXIF_SCAN_BYTES = 128 * 1024
+
+    # (bit depth, color type) -> Pillow mode for PNG images
+    # 16-bit grayscale is left out: its mode differs across Pillow versions
+    _PNG_MODES = {
+        (1, 0): '1', (2, 0): 'L', (4, 0): 'L', (8, 0): 'L',
+        (8, 2): 'RGB', (16, 2): 'RGB',
+        (1, 3): 'P', (2, 3): 'P', (4, 3): 'P', (8, 3): 'P',
+        (8, 4): 'LA', (16, 4): 'RGBA',
+        (8, 6): 'RGBA', (16, 6): 'RGBA',
+    }
+
+    # Units used by _format_bytes, in steps of 1024
+    _BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+    # Pillow modes with an alpha channel (including premultiplied variants)
+    _ALPHA_MODES = frozenset({'RGBA', 'RGBa', 'LA', 'La', 'PA'})
+
+    # (IFD name, tag id) -> tag name, flattened from piexif.TAGS
+    _TAG_NAMES = {
+        (ifd_name, tag): info["name"]
+        for ifd_name in ("0th", "Exif", "GPS", "1st")
+        for tag, info in piexif.TAGS[ifd_name].items()
+    }
+
+    # MakerNote prefix -> parse result for that maker
+    _MAKERNOTE_SIGNATURES = {
+        b'Apple': {'Camera Maker': 'Apple iPhone', 'Type': 'Apple MakerNote'},
+        b'Canon': {'Camera Maker': 'Canon', 'Type': 'Canon MakerNote (Binary Format)'},
+        b'Nikon': {'Camera Maker': 'Nikon', 'Type': 'Nikon MakerNote (Binary Format)'},
+        b'SONY': {'Camera Maker': 'Sony', 'Type': 'Sony MakerNote (Binary Format)'},
+        b'Panasonic': {'Camera Maker': 'Panasonic', 'Type': 'Panasonic MakerNote (Binary Format)'},
+        b'FUJIFILM': {'Camera Maker': 'Fujifilm', 'Type': 'Fujifilm MakerNote (Binary Format)'},
+        b'Olympus': {'Camera Maker': 'Olympus', 'Type': 'Olympus MakerNote (Binary Format)'},
+    }
+    _MAKERNOTE_SIGNATURE_LENGTHS = sorted({len(prefix) for prefix in _MAKERNOTE_SIGNATURES}, reverse=True)
+
+    # Bytes dropped when pulling readable text out of an unknown MakerNote
+    # (everything except printable ASCII, newline and tab)
+    _MAKERNOTE_UNPRINTABLE = bytes(b for b in range(256) if not (32 <= b <= 126 or b in b'\n\t'))
+
+    # JPEG start-of-frame markers (SOF0-SOF15, excluding DHT/JPG/DAC)
+    _JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
     @staticmethod
     def is_supported_image(file_path: Path) -> bool:
         """Check if file is a supported image format."""
-        return file_path.suffix.lower() in MetadataParser.SUPPORTED_FORMATS
+        return file_path.suffix.lower() in MetadataParser._SUPPORTED_EXTENSIONS
 
     @staticmethod
-    def get_basic_info(file_path: Path) -> Dict:
-        """Extract basic file and image information."""
+    def get_basic_info(file_path: Path, file_stat: Optional[os.stat_result] = None,
+                       image: Optional[Image.Image] = None) -> Dict:
+        """
+        Extract basic file and image information.
+        Pass file_stat (e.g. from an os.scandir entry) to skip the stat call,
+        and an already opened image to skip reading the header again.
+        """
         try:
-            file_stat = file_path.stat()
-            image = Image.open(file_path)
+            if file_stat is None:
+                file_stat = file_path.stat()
+            
+            if image is not None:
+                header = (image.format, image.width, image.height,
+                          image.mode, image.info.get('dpi'))
+            else:
+                # Parse JPEG/PNG headers directly; let Pillow handle anything else
+                header = MetadataParser._sniff_header(file_path)
+            if header is None:
+                with Image.open(file_path) as image:
+                    header = (image.format, image.width, image.height,
+                              image.mode, image.info.get('dpi'))
+            file_format, width, height, mode, dpi = header
             
             basic_info = {
                 'Filename': file_path.name,
                 'File Path': str(file_path),
                 'File Size': MetadataParser._format_bytes(file_stat.st_size),
-                'File Format': image.format,
-                'Image Width': f"{image.width} px",
-                'Image Height': f"{image.height} px",
-                'Image Mode': image.mode,
-                'DPI': str(image.info.get('dpi', 'Not specified')),
+                'File Format': file_format,
+                'Image Width': f"{width} px",
+                'Image Height': f"{height} px",
+                'Image Mode': mode,
+                'DPI': str(dpi if dpi is not None else 'Not specified'),
             }
             
             # Add modification date
-            mod_time = datetime.fromtimestamp(file_stat.st_mtime)
-            basic_info['Modified Date'] = mod_time.strftime('%Y-%m-%d %H:%M:%S')
+            basic_info['Modified Date'] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(file_stat.st_mtime))
             
             return basic_info
         except Exception as e:
             return {'Error': str(e)}
 
+    @staticmethod
+    def _sniff_header(file_path: Path) -> Optional[Tuple[str, int, int, str, Optional[tuple]]]:
+        """
+        Read (format, width, height, mode, dpi) straight from a JPEG or PNG
+        header, matching what Pillow would report. Returns None for other
+        formats and for files whose header needs Pillow to interpret.
+        """
+        with open(file_path, 'rb') as f:
+            data = f.read(MetadataParser.EXIF_SCAN_BYTES)
+        
+        if data[:8] == b'\x89PNG\r\n\x1a\n':
+            return MetadataParser._sniff_png(data)
+        if data[:2] == b'\xff\xd8':
+            return MetadataParser._sniff_jpeg(data)
+        return None
+
+    @staticmethod
+    def _sniff_png(data: bytes) -> Optional[Tuple[str, int, int, str, Optional[tuple]]]:
+        """Parse the IHDR chunk and any pHYs chunk ahead of the image data."""
+        if data[12:16] != b'IHDR' or len(data) < 33:
+            return None
+        width, height, bit_depth, color_type = struct.unpack_from('>IIBB', data, 16)
+        mode = MetadataParser._PNG_MODES.get((bit_depth, color_type))
+        if mode is None:
+            return None
+        
+        dpi = None
+        pos = 33
+        while True:
+            if pos + 8 > len(data):
+                return None
+            length, chunk_type = struct.unpack_from('>I4s', data, pos)
+            if chunk_type == b'IDAT':
+                break
+            if chunk_type == b'pHYs' and length >= 9:
+                if pos + 17 > len(data):
+                    return None
+                px, py, unit = struct.unpack_from('>IIB', data, pos + 8)
+                if unit == 1:
+                    # Pixels per metre
+                    dpi = (px * 0.0254, py * 0.0254)
+            pos += 12 + length
+        
+        return ('PNG', width, height, mode, dpi)
+
+    @staticmethod
+    def _sniff_jpeg(data: bytes) -> Optional[Tuple[str, int, int, str, Optional[tuple]]]:
+        """Walk the JPEG markers up to start of scan, reading JFIF and SOF."""
+        frame = None
+        dpi = None
+        exif = None
+        pos = 2
+        while True:
+            if pos + 4 > len(data) or data[pos] != 0xFF:
+                return None
+            
+            marker = data[pos + 1]
+            if marker == 0xFF:
+                # Fill byte before a marker
+                pos += 1
+                continue
+            if marker == 0xDA:
+                break
+            
+            length = struct.unpack_from('>H', data, pos + 2)[0]
+            segment = data[pos + 4:pos + 2 + length]
+            if len(segment) != length - 2:
+                return None
+            
+            if marker in MetadataParser._JPEG_SOF_MARKERS and length >= 8:
+                frame = segment
+            elif marker == 0xE0 and segment.startswith(b'JFIF') and length >= 14:
+                unit = segment[7]
+                density = struct.unpack_from('>HH', segment, 8)
+                if unit == 1:
+                    dpi = density
+                elif unit == 2:
+                    # Dots per centimetre
+                    dpi = tuple(d * 2.54 for d in density)
+            elif marker == 0xE1 and segment.startswith(b'Exif\x00\x00') and exif is None:
+                exif = segment
+            elif marker == 0xE2 and segment.startswith(b'MPF\x00'):
+                # Possibly an MPO, which Pillow reports as its own format
+                return None
+            
+            pos += 2 + length
+        
+        if frame is None or frame[0] != 8:
+            return None
+        if dpi is None and exif is not None:
+            # Without a JFIF density Pillow takes the DPI from the EXIF data,
+            # defaulting to 72 when the resolution tags are missing or invalid
+            try:
+                ifd0 = piexif.load(exif)["0th"]
+            except Exception:
+                return None
+            x_resolution = ifd0.get(piexif.ImageIFD.XResolution)
+            resolution_unit = ifd0.get(piexif.ImageIFD.ResolutionUnit)
+            if resolution_unit is None or not x_resolution or not x_resolution[1]:
+                dpi = (72, 72)
+            else:
+                value = x_resolution[0] / x_resolution[1]
+                if resolution_unit == 3:
+                    # Dots per centimetre
+                    value *= 2.54
+                dpi = (value, value)
+        mode = {1: 'L', 3: 'RGB', 4: 'CMYK'}.get(frame[5])
+        if mode is None:
+            return None
+        height, width = struct.unpack_from('>HH', frame, 1)
+        
+        return ('JPEG', width, height, mode, dpi)
+
     @staticmethod
     def parse_makernote(makernote_data) -> Dict:
         """Parse and make MakerNote data human-readable."""
@@ -67,38 +250,25 @@ class MetadataParser:
                 makernote_data = makernote_str.encode() if isinstance(makernote_str, str) else makernote_data
             
             # Detect camera maker from MakerNote signature
-            if makernote_data.startswith(b'Apple'):
-                makernote_info['Camera Maker'] = 'Apple iPhone'
-                makernote_info['Type'] = 'Apple MakerNote'
-            elif makernote_data.startswith(b'Canon'):
-                makernote_info['Camera Maker'] = 'Canon'
-                makernote_info['Type'] = 'Canon MakerNote (Binary Format)'
-            elif makernote_data.startswith(b'Nikon'):
-                makernote_info['Camera Maker'] = 'Nikon'
-                makernote_info['Type'] = 'Nikon MakerNote (Binary Format)'
-            elif makernote_data.startswith(b'SONY'):
-                makernote_info['Camera Maker'] = 'Sony'
-                makernote_info['Type'] = 'Sony MakerNote (Binary Format)'
-            elif makernote_data.startswith(b'Panasonic'):
-                makernote_info['Camera Maker'] = 'Panasonic'
-                makernote_info['Type'] = 'Panasonic MakerNote (Binary Format)'
-            elif makernote_data.startswith(b'FUJIFILM'):
-                makernote_info['Camera Maker'] = 'Fujifilm'
-                makernote_info['Type'] = 'Fujifilm MakerNote (Binary Format)'
-            elif makernote_data.startswith(b'Olympus'):
-                makernote_info['Camera Maker'] = 'Olympus'
-                makernote_info['Type'] = 'Olympus MakerNote (Binary Format)'
+            for length in MetadataParser._MAKERNOTE_SIGNATURE_LENGTHS:
+                known = MetadataParser._MAKERNOTE_SIGNATURES.get(makernote_data[:length])
+                if known:
+                    return dict(known)
             else:
                 # Try to extract readable text
                 makernote_info['Camera Maker'] = 'Unknown/Proprietary'
-                try:
-                    text = makernote_data.decode('utf-8', errors='ignore')
-                    readable_chars = ''.join(c for c in text if 32 <= ord(c) <= 126 or c in '\n\t')
-                    if readable_chars:
-                        makernote_info['Readable Data'] = readable_chars[:150]
-                    else:
-                        makernote_info['Type'] = f'Binary MakerNote ({len(makernote_data)} bytes)'
-                except:
+                # Only 150 characters are kept, so filter 2 KiB at a time and
+                # stop early instead of copying a RAW file's whole MakerNote
+                readable_chars = ''
+                for start in range(0, len(makernote_data), 2048):
+                    readable_chars += makernote_data[start:start + 2048].translate(
+                        None, MetadataParser._MAKERNOTE_UNPRINTABLE
+                    ).decode('ascii')
+                    if len(readable_chars) >= 150:
+                        break
+                if readable_chars:
+                    makernote_info['Readable Data'] = readable_chars[:150]
+                else:
                     makernote_info['Type'] = f'Binary MakerNote ({len(makernote_data)} bytes)'
         
         except Exception as e:
@@ -107,13 +277,108 @@ class MetadataParser:
         return makernote_info
 
     @staticmethod
-    def get_exif_data(file_path: Path) -> Dict:
+    def load_exif(file_path: Path, file_stat: Optional[os.stat_result] = None) -> Dict:
+        """
+        Load the EXIF dict of an image with piexif.
+        Parsed results are cached per (path, mtime, ctime, size), so reading and
+        then editing a file parses it once. Each call returns fresh IFD
+        dicts that the caller may modify.
+        """
+        if file_stat is None:
+            file_stat = file_path.stat()
+        exif_dict = MetadataParser._load_exif_cached(
+            str(file_path), file_stat.st_mtime_ns, file_stat.st_ctime_ns, file_stat.st_size
+        )
+        return {
+            ifd_name: dict(ifd) if isinstance(ifd, dict) else ifd
+            for ifd_name, ifd in exif_dict.items()
+        }
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _load_exif_cached(path: str, mtime_ns: int, ctime_ns: int, size: int) -> Dict:
+        """Parse EXIF from disk; only called on a cache miss."""
+        segment = MetadataParser.read_exif_segment(Path(path))
+        if segment is None:
+            return piexif.load(path)
+        
+        # JPEG/PNG: parse just the EXIF block, or nothing if there is none
+        if segment:
+            return piexif.load(segment)
+        return {"0th": {}, "Exif": {}, "GPS": {}, "Interop": {}, "1st": {}, "thumbnail": None}
+
+    @staticmethod
+    def read_exif_segment(file_path: Path) -> Optional[bytes]:
+        """
+        Read the raw EXIF block of a JPEG (APP1 segment, single header read)
+        or a PNG (eXIf chunk). Returns the payload starting with the 'Exif'
+        header, b'' when the image has no EXIF block, or None when the file
+        is neither format or the block could not be located reliably.
+        """
+        with open(file_path, 'rb') as f:
+            data = f.read(MetadataParser.EXIF_SCAN_BYTES)
+            if data[:8] == b'\x89PNG\r\n\x1a\n':
+                return MetadataParser._read_png_exif(f)
+        
+        if data[:2] != b'\xff\xd8':
+            return None
+        
+        pos = 2
+        while pos + 4 <= len(data):
+            if data[pos] != 0xFF:
+                return None
+            
+            marker = data[pos + 1]
+            if marker == 0xFF:
+                # Fill byte before a marker
+                pos += 1
+                continue
+            if marker in (0xDA, 0xD9):
+                # Start of scan / end of image: no EXIF segment
+                return b''
+            
+            length = struct.unpack_from('>H', data, pos + 2)[0]
+            if marker == 0xE1 and data[pos + 4:pos + 10] == b'Exif\x00\x00':
+                segment = data[pos + 4:pos + 2 + length]
+                return segment if len(segment) == length - 2 else None
+            
+            pos += 2 + length
+        
+        return None
+
+    @staticmethod
+    def _read_png_exif(f) -> Optional[bytes]:
+        """Walk the chunk headers of an open PNG, reading only an eXIf chunk."""
+        f.seek(8)
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            
+            length, chunk_type = struct.unpack('>I4s', header)
+            if chunk_type == b'eXIf':
+                payload = f.read(length)
+                if len(payload) != length:
+                    return None
+                # The chunk normally holds bare TIFF data
+                return payload if payload.startswith(b'Exif\x00\x00') else b'Exif\x00\x00' + payload
+            if chunk_type == b'IEND':
+                return b''
+            
+            # Skip the chunk data and its CRC
+            f.seek(length + 4, os.SEEK_CUR)
+
+    @staticmethod
+    def get_exif_data(file_path: Path, file_stat: Optional[os.stat_result] = None) -> Dict:
         """Extract EXIF data from image."""
+        if file_path.suffix.lower() not in MetadataParser.EXIF_CAPABLE_FORMATS:
+            return {'Note': 'Format does not support EXIF'}
+        
         exif_data = {}
         
         try:
             # Try using piexif for comprehensive EXIF data
-            exif_dict = piexif.load(str(file_path))
+            exif_dict = MetadataParser.load_exif(file_path, file_stat)
             
             # Process different EXIF categories
             for ifd_name in ("0th", "Exif", "GPS", "1st"):
@@ -122,10 +387,7 @@ class MetadataParser:
                     continue
                     
                 for tag, value in ifd.items():
-                    try:
-                        tag_name = piexif.TAGS[ifd_name][tag]["name"]
-                    except:
-                        tag_name = str(tag)
+                    tag_name = MetadataParser._TAG_NAMES.get((ifd_name, tag)) or str(tag)
                     
                     # Handle MakerNote specially
                     if tag_name == 'MakerNote':
@@ -135,125 +397,248 @@ class MetadataParser:
                                 exif_data[f'MakerNote - {key}'] = val
                         continue
                     
-                    try:
-                        if isinstance(value, bytes):
-                            value = value.decode('utf-8', errors='ignore').strip()
-                        else:
-                            value = str(value).strip()
-                        
-                        # Only add non-empty values
-                        if value and value != '':
-                            exif_data[tag_name] = value
-                    except:
-                        try:
-                            value = str(value)[:100].strip()
-                            if value and value != '':
-                                exif_data[tag_name] = value
-                        except:
-                            pass
+                    if isinstance(value, bytes):
+                        value = value.decode('utf-8', errors='ignore').strip()
+                    else:
+                        value = str(value).strip()
+                    
+                    # Only add non-empty values
+                    if value:
+                        exif_data[tag_name] = value
         
         except Exception as e:
             # Fallback to PIL's EXIF extraction
             try:
-                image = Image.open(file_path)
-                exif = image.getexif()
+                with Image.open(file_path) as image:
+                    if image.format == 'PNG':
+                        # getexif() on a PNG decodes the whole image to look for
+                        # an eXIf chunk after the pixel data; only use a chunk
+                        # already read with the header
+                        exif = Image.Exif()
+                        if 'exif' in image.info:
+                            exif.load(image.info['exif'])
+                    else:
+                        exif = image.getexif()
                 
                 if exif:
                     for tag_id, value in exif.items():
-                        try:
-                            tag_name = TAGS.get(tag_id, str(tag_id))
-                        except:
-                            tag_name = str(tag_id)
+                        tag_name = TAGS.get(tag_id, str(tag_id))
+                        
+                        if isinstance(value, bytes):
+                            value = value.decode('utf-8', errors='ignore').strip()
+                        else:
+                            value = str(value).strip()
                         
-                        try:
-                            if isinstance(value, bytes):
-                                value = value.decode('utf-8', errors='ignore').strip()
-                            else:
-                                value = str(value).strip()
-                            
-                            # Only add non-empty values
-                            if value and value != '':
-                                exif_data[tag_name] = value
-                        except:
-                            try:
-                                value = str(value)[:100].strip()
-                                if value and value != '':
-                                    exif_data[tag_name] = value
-                            except:
-                                pass
+                        # Only add non-empty values
+                        if value:
+                            exif_data[tag_name] = value
             except Exception:
                 pass
         
         return exif_data if exif_data else {'Note': 'No EXIF data found'}
 
     @staticmethod
-    def get_image_properties(file_path: Path) -> Dict:
-        """Extract additional image properties."""
+    def get_image_properties(file_path: Path, image: Optional[Image.Image] = None) -> Dict:
+        """
+        Extract additional image properties.
+        Pass an already opened image to skip reopening the file.
+        """
         properties = {}
         
         try:
-            image = Image.open(file_path)
-            
-            # Color profile info
-            if 'icc_profile' in image.info:
-                properties['Has Color Profile'] = 'Yes'
+            if image is None:
+                with Image.open(file_path) as image:
+                    MetadataParser._read_image_properties(image, properties)
             else:
-                properties['Has Color Profile'] = 'No'
-            
-            # Animation info
-            if hasattr(image, 'is_animated'):
-                properties['Is Animated'] = 'Yes' if image.is_animated else 'No'
-                if image.is_animated:
-                    properties['Number of Frames'] = str(getattr(image, 'n_frames', 'Unknown'))
-            
-            # Check for transparency
-            if image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info:
-                properties['Has Transparency'] = 'Yes'
-            else:
-                properties['Has Transparency'] = 'No'
-            
-            # Image info
-            for key, value in image.info.items():
-                if key not in ('icc_profile', 'transparency', 'dpi'):
-                    try:
-                        properties[key] = str(value)[:100]
-                    except:
-                        pass
-        
+                MetadataParser._read_image_properties(image, properties)
         except Exception as e:
             properties['Error'] = str(e)
         
         return properties
 
     @staticmethod
-    def get_all_metadata(file_path: Path) -> Dict:
-        """Get all metadata for an image file."""
+    def _read_image_properties(image: Image.Image, properties: Dict):
+        """Fill properties from an open image."""
+        # Color profile info
+        if 'icc_profile' in image.info:
+            properties['Has Color Profile'] = 'Yes'
+        else:
+            properties['Has Color Profile'] = 'No'
+        
+        # Animation info
+        if hasattr(image, 'is_animated'):
+            properties['Is Animated'] = 'Yes' if image.is_animated else 'No'
+            if image.is_animated:
+                properties['Number of Frames'] = str(getattr(image, 'n_frames', 'Unknown'))
+        
+        # Check for transparency
+        if image.mode in MetadataParser._ALPHA_MODES or 'transparency' in image.info:
+            properties['Has Transparency'] = 'Yes'
+        else:
+            properties['Has Transparency'] = 'No'
+        
+        # Image info
+        for key, value in image.info.items():
+            if key not in ('icc_profile', 'transparency', 'dpi'):
+                try:
+                    properties[key] = str(value)[:100]
+                except:
+                    pass
+
+    @staticmethod
+    def get_all_metadata(file_path: Path, file_stat: Optional[os.stat_result] = None) -> Dict:
+        """
+        Get all metadata for an image file.
+        Results are cached per (path, mtime, ctime, size), so re-reading an
+        unchanged file is free. Each call returns fresh section dicts.
+        """
         if not MetadataParser.is_supported_image(file_path):
             return {'Error': 'Unsupported file format'}
         
+        try:
+            if file_stat is None:
+                file_stat = file_path.stat()
+        except OSError:
+            # Nothing to key a cache entry on; let each section report the error
+            return MetadataParser._read_all_metadata(file_path, None)
+        
+        metadata = MetadataParser._all_metadata_cached(
+            str(file_path), file_stat.st_mtime_ns, file_stat.st_ctime_ns, file_stat.st_size
+        )
+        return {section: dict(data) if isinstance(data, dict) else data
+                for section, data in metadata.items()}
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _all_metadata_cached(path: str, mtime_ns: int, ctime_ns: int, size: int) -> Dict:
+        """Read all metadata from disk; only called on a cache miss."""
+        return MetadataParser._read_all_metadata(Path(path), None)
+
+    @staticmethod
+    def _read_all_metadata(file_path: Path, file_stat: Optional[os.stat_result]) -> Dict:
+        """Read every metadata section, opening the file only once."""
+        try:
+            if file_stat is None:
+                file_stat = file_path.stat()
+            fp = open(file_path, 'rb')
+        except OSError:
+            # Let each section report its own error
+            return MetadataParser._read_sections_separately(file_path, file_stat)
+        
+        with fp:
+            # Mis-named or truncated files stop here, before Pillow or piexif
+            if MetadataParser._sniff_magic(fp.read(16)) is None:
+                return {'Error': 'File is not a recognised image'}
+            fp.seek(0)
+            
+            try:
+                image = Image.open(fp)
+            except Exception:
+                return MetadataParser._read_sections_separately(file_path, file_stat)
+            
+            # Stat and open the file once and share them between the sections
+            with image:
+                return {
+                    'Basic Information': MetadataParser.get_basic_info(file_path, file_stat, image),
+                    'EXIF Data': MetadataParser.get_exif_data(file_path, file_stat),
+                    'Image Properties': MetadataParser.get_image_properties(file_path, image),
+                }
+
+    @staticmethod
+    def _read_sections_separately(file_path: Path, file_stat: Optional[os.stat_result]) -> Dict:
+        """Read each section on its own so that each reports its own error."""
         return {
-            'Basic Information': MetadataParser.get_basic_info(file_path),
-            'EXIF Data': MetadataParser.get_exif_data(file_path),
+            'Basic Information': MetadataParser.get_basic_info(file_path, file_stat),
+            'EXIF Data': MetadataParser.get_exif_data(file_path, file_stat),
             'Image Properties': MetadataParser.get_image_properties(file_path),
         }
 
+    @staticmethod
+    def _sniff_magic(header: bytes) -> Optional[str]:
+        """Identify a supported image format from its first bytes, or None."""
+        if header[:3] == b'\xff\xd8\xff':
+            return 'JPEG'
+        if header[:8] == b'\x89PNG\r\n\x1a\n':
+            return 'PNG'
+        if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+            return 'WEBP'
+        if header[:4] in (b'II*\x00', b'MM\x00*', b'II+\x00', b'MM\x00+'):
+            return 'TIFF'
+        if header[:4] == b'GIF8':
+            return 'GIF'
+        if header[:2] == b'BM':
+            return 'BMP'
+        if header[:4] == b'\x00\x00\x01\x00':
+            return 'ICO'
+        if header[:1] == b'P' and header[1:2] in b'123456' and header[2:3].isspace():
+            return 'PNM'
+        return None
+
+    @staticmethod
+    def clear_cache():
+        """Drop all cached metadata and EXIF parses."""
+        MetadataParser._all_metadata_cached.cache_clear()
+        MetadataParser._load_exif_cached.cache_clear()
+
+    @staticmethod
+    def get_all_metadata_batch(file_paths: List[Path],
+                               max_workers: Optional[int] = None,
+                               use_processes: bool = False) -> Iterator[Tuple[Path, Dict]]:
+        """
+        Get metadata for many image files, reading them concurrently.
+        Yields (path, metadata) pairs in input order as soon as each is
+        ready, so callers can display results incrementally.
+        With use_processes, files are parsed in worker processes (one per
+        CPU by default); piexif decodes in pure Python, so this scales
+        better than threads for large batches of tag-heavy files.
+        """
+        if use_processes:
+            # Imported here: it pulls in multiprocessing, which only this mode needs
+            from concurrent.futures import ProcessPoolExecutor
+            
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                yield from zip(file_paths, executor.map(MetadataParser.get_all_metadata,
+                                                        file_paths, chunksize=32))
+            return
+        
+        if max_workers is None:
+            # File reads are I/O bound, so oversubscribe the CPUs
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            yield from zip(file_paths, executor.map(MetadataParser.get_all_metadata, file_paths))
+
     @staticmethod
     def _format_bytes(bytes_size: int) -> str:
         """Format bytes to human-readable format."""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if bytes_size < 1024.0:
-                return f"{bytes_size:.2f} {unit}"
-            bytes_size /= 1024.0
-        return f"{bytes_size:.2f} TB"
+        # Each unit is 2**10 times the previous one, so the unit index
+        # follows from the bit length without a division loop
+        units = MetadataParser._BYTE_UNITS
+        index = min(len(units) - 1, max(0, (bytes_size.bit_length() - 1) // 10))
+        return f"{bytes_size / (1 << (index * 10)):.2f} {units[index]}"
 
     @staticmethod
-    def find_images_in_directory(directory: Path) -> List[Path]:
-        """Find all supported image files in a directory."""
-        images = []
-        try:
-            for file_path in directory.rglob('*'):
-                if file_path.is_file() and MetadataParser.is_supported_image(file_path):
-                    images.append(file_path)
-        except Exception:
-            pass
-        return sorted(images)
+    def find_images_in_directory(directory: Path, extensions: Optional[frozenset] = None) -> List[Path]:
+        """
+        Find all supported image files in a directory.
+        Pass extensions (lower-case, with the dot) to look for a different set of suffixes.
+        """
+        return sorted(MetadataParser._walk_images(directory, extensions))
+
+    @staticmethod
+    def _walk_images(directory, extensions: Optional[frozenset] = None) -> Iterator[Path]:
+        """Recursively yield supported images, checking the suffix before any stat."""
+        # Hoisted lookups: this loop runs once per directory entry
+        supported = extensions or MetadataParser._SUPPORTED_EXTENSIONS
+        splitext = os.path.splitext
+        pending = [directory]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if splitext(entry.name)[1].lower() in supported and entry.is_file():
+                            yield Path(entry.path)
+                        elif entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+            except OSError:
+                pass
@@ -4,34 +4,198 @@ Modern PyQt6-based interface for viewing image metadata with advanced features.
 """
 
 import sys
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
     QPushButton, QFileDialog, QLabel, QScrollArea, QFrame,
-    QListWidget, QListWidgetItem, QTabWidget, QDialog, QLineEdit,
-    QFormLayout, QMessageBox, QDialogButtonBox, QComboBox, QCheckBox,
-    QSpinBox, QDoubleSpinBox, QTextEdit, QMenu
+    QListWidget, QTabWidget, QDialog, QLineEdit,
+    QFormLayout, QGridLayout, QMessageBox, QDialogButtonBox, QComboBox, QCheckBox,
+    QSpinBox, QDoubleSpinBox, QTextEdit, QMenu, QTableView, QHeaderView,
+    QAbstractItemView
 )
-from PyQt6.QtGui import QPixmap, QIcon, QFont, QColor, QAction
-from PyQt6.QtCore import Qt, QSize, QTimer
-from metadata_parser import MetadataParser
-from metadata_editor import MetadataEditor
+from PyQt6.QtGui import QPixmap, QImage, QImageReader, QIcon, QFont, QColor, QAction
+from PyQt6.QtCore import Qt, QSize, QTimer, QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool, pyqtSignal
 from tagging_system import TaggingSystem
-from gps_handler import GPSHandler
-from privacy_handler import PrivacyHandler
-from image_operations import ImageOperations
+
+
+@lru_cache(maxsize=None)
+def _font(family: str, size: int, bold: bool = False, italic: bool = False) -> QFont:
+    """Return a shared QFont, built on first use once the QApplication exists."""
+    font = QFont(family, size)
+    font.setBold(bold)
+    font.setItalic(italic)
+    return font
+
+
+@lru_cache(maxsize=128)
+def _load_scaled(path_str: str, mtime_ns: int, ctime_ns: int, size: int, height: int) -> QImage:
+    """Decode an image once and cache its preview; mtime/ctime/size keep the entry fresh."""
+    # Ask the decoder for the target size so JPEGs are downscaled during decoding
+    reader = QImageReader(path_str)
+    reader.setAutoTransform(True)
+    src_size = reader.size()
+    if src_size.isValid():
+        reader.setScaledSize(src_size.scaled(QSize(10000, height), Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull() or image.height() == height:
+        return image
+    # Rotated images come out with width and height swapped; fix up the small result
+    return image.scaledToHeight(height, Qt.TransformationMode.SmoothTransformation)
+
+
+def _read_preview_and_metadata(file_path: Path):
+    """Return the cached (preview QImage, metadata dict) for a file."""
+    from metadata_parser import MetadataParser
+    
+    # QImage rather than QPixmap: only QImage may be used outside the GUI thread
+    try:
+        st = file_path.stat()
+        image = _load_scaled(str(file_path), st.st_mtime_ns, st.st_ctime_ns, st.st_size, 250)
+    except OSError:
+        st = None
+        image = QImage()
+    metadata = MetadataParser.get_all_metadata(file_path, st)
+    return image, metadata
+
+
+class LoadSignals(QObject):
+    """Signals emitted by LoadWorker back to the GUI thread."""
+    
+    finished = pyqtSignal(int, QImage, dict)
+
+
+class LoadWorker(QRunnable):
+    """Decode the preview and read metadata for one image off the GUI thread."""
+    
+    def __init__(self, generation: int, file_path: Path):
+        super().__init__()
+        self.generation = generation
+        self.file_path = file_path
+        self.signals = LoadSignals()
+    
+    def run(self):
+        image, metadata = _read_preview_and_metadata(self.file_path)
+        self.signals.finished.emit(self.generation, image, metadata)
+
+
+class PrefetchWorker(QRunnable):
+    """Warm the preview and metadata caches for images the user is likely to open next."""
+    
+    def __init__(self, file_paths):
+        super().__init__()
+        self.file_paths = file_paths
+    
+    def run(self):
+        for file_path in self.file_paths:
+            _read_preview_and_metadata(file_path)
+
+
+class TaskSignals(QObject):
+    """Signals emitted by TaskWorker back to the GUI thread."""
+    
+    finished = pyqtSignal(bool)
+
+
+class TaskWorker(QRunnable):
+    """Run one file operation that returns success as a bool off the GUI thread."""
+    
+    def __init__(self, task):
+        super().__init__()
+        self.task = task
+        self.signals = TaskSignals()
+    
+    def run(self):
+        try:
+            ok = bool(self.task())
+        except Exception:
+            ok = False
+        self.signals.finished.emit(ok)
+
+
+class MetadataModel(QAbstractTableModel):
+    """Two-column (field, value) model; text is only produced for rows Qt paints."""
+    
+    HEADERS = ('Field', 'Value')
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+    
+    def set_rows(self, rows):
+        """Replace all rows with the given (key, value) pairs in one reset."""
+        self.beginResetModel()
+        self._rows = list(rows)
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return str(self._rows[index.row()][index.column()])
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
 
 
 class EditMetadataDialog(QDialog):
     """Dialog for editing metadata fields and file timestamps."""
     
+    # Category mapping for smart organization
+    CATEGORY_KEYWORDS = {
+        '📅 Date & Time': ['date', 'time', 'datetime', 'timestamp', 'subsec'],
+        '👤 Creator Info': ['artist', 'author', 'copyright', 'software', 'description', 'maker', 'rights'],
+        '📷 Camera Info': ['make', 'model', 'lens', 'equipment', 'camera', 'serial', 'body'],
+        '🎯 Exposure Settings': ['exposure', 'iso', 'shutter', 'aperture', 'f-number', 'metering', 'program', 'mode', 'speed', 'bias'],
+        '🔍 Focus & Flash': ['focal', 'flash', 'focus', 'distance', 'af', 'auto'],
+        '🎨 Image Properties': ['orientation', 'resolution', 'dpi', 'color', 'saturation', 'contrast', 'brightness', 'white', 'balance', 'compression', 'bits'],
+        '� Location': ['gps', 'latitude', 'longitude', 'altitude', 'location', 'coordinate'],
+        '📝 Additional Info': ['subject', 'keywords', 'comment', 'unique', 'tag', 'category'],
+        '🎬 Media Info': ['duration', 'frame', 'animation', 'loop', 'codec', 'profile'],
+    }
+    
+    OTHER_CATEGORY = '🔧 Other Fields'
+    
+    # Display order of the category sections, catch-all last
+    CATEGORY_ORDER = tuple(CATEGORY_KEYWORDS) + (OTHER_CATEGORY,)
+    
+    # Flat (keyword, category) table in category order; the first hit wins
+    _KEYWORD_CATEGORIES = tuple(
+        (keyword, category)
+        for category, keywords in CATEGORY_KEYWORDS.items()
+        for keyword in keywords
+    )
+    
+    # Height reserved for a field row before its widgets are built
+    ESTIMATED_ROW_HEIGHT = 33
+    
     def __init__(self, parent=None, metadata=None, file_path=None):
         super().__init__(parent)
-        self.metadata = metadata or {}
-        self.file_path = file_path
+        self.metadata = {}
+        self.file_path = None
         self.edited_data = {}
         self.file_timestamp = None
+        self.field_inputs = {}
+        self.original_values = {}
+        
+        # Pooled rows, reused by repopulate() so reopening skips widget construction
+        self._header_pool = []
+        self._field_pool = []
+        self._placed = []
+        self._grid_rows = 0
+        self._pending_sections = []
+        self._fields_used = 0
+        
         self.init_ui()
+        self.repopulate(metadata, file_path)
     
     def init_ui(self):
         """Initialize the dialog UI."""
@@ -42,9 +206,7 @@ class EditMetadataDialog(QDialog):
         
         # Info label
         info_label = QLabel('ℹ️ Original value shown in gray, edit in the input field - Shows ALL available metadata from image\n🔒 You can also edit File Last Modified time below to make changes untraceable')
-        info_font = QFont('System', 10)
-        info_font.setItalic(True)
-        info_label.setFont(info_font)
+        info_label.setFont(_font('System', 10, italic=True))
         info_label.setStyleSheet("color: #666;")
         main_layout.addWidget(info_label)
         
@@ -54,28 +216,18 @@ class EditMetadataDialog(QDialog):
         timestamp_layout = QVBoxLayout(timestamp_group)
         
         timestamp_label = QLabel('⏰ File Last Modified Date & Time (Make Changes Untraceable)')
-        timestamp_font = QFont('System', 11)
-        timestamp_font.setBold(True)
-        timestamp_label.setFont(timestamp_font)
+        timestamp_label.setFont(_font('System', 11, bold=True))
         timestamp_label.setStyleSheet("color: #2c3e50;")
         timestamp_layout.addWidget(timestamp_label)
         
         timestamp_form = QFormLayout()
         timestamp_form.setSpacing(8)
         
-        # Get current file timestamp
-        if self.file_path:
-            from metadata_editor import MetadataEditor
-            current_timestamp = MetadataEditor.get_file_timestamp(self.file_path)
-        else:
-            current_timestamp = ""
-        
-        current_ts_label = QLabel(f"Current: {current_timestamp}")
-        current_ts_label.setStyleSheet("color: #999; font-style: italic;")
-        timestamp_form.addRow("Current Timestamp:", current_ts_label)
+        self.current_ts_label = QLabel()
+        self.current_ts_label.setStyleSheet("color: #999; font-style: italic;")
+        timestamp_form.addRow("Current Timestamp:", self.current_ts_label)
         
         self.timestamp_input = QLineEdit()
-        self.timestamp_input.setText(current_timestamp)
         self.timestamp_input.setPlaceholderText("Format: YYYY-MM-DD HH:MM:SS")
         self.timestamp_input.setMinimumHeight(32)
         self.timestamp_input.setToolTip("Edit to change when the file appears to have been last modified")
@@ -89,140 +241,224 @@ class EditMetadataDialog(QDialog):
         main_layout.addWidget(timestamp_group)
         
         # Scrollable area for form
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        
+        self.scroll_widget = QWidget()
+        self.grid_layout = QGridLayout(self.scroll_widget)
+        self.grid_layout.setSpacing(5)
+        self.grid_layout.setColumnStretch(1, 1)
+        self.grid_layout.setColumnStretch(2, 1)
+        
+        self.scroll_area.setWidget(self.scroll_widget)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self._materialize_visible)
+        main_layout.addWidget(self.scroll_area)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        
+        save_button = QPushButton('💾 Save All Changes')
+        save_button.clicked.connect(self.save_changes)
+        save_button.setMinimumHeight(35)
+        save_button.setFont(_font('System', 11))
         
-        scroll_widget = QWidget()
-        form_layout = QFormLayout(scroll_widget)
-        form_layout.setSpacing(5)
+        clear_button = QPushButton('🔄 Clear Empty Fields')
+        clear_button.clicked.connect(self.clear_empty_fields)
+        clear_button.setMinimumHeight(35)
+        clear_button.setFont(_font('System', 11))
+        
+        cancel_button = QPushButton('❌ Cancel')
+        cancel_button.clicked.connect(self.reject)
+        cancel_button.setMinimumHeight(35)
+        cancel_button.setFont(_font('System', 11))
+        
+        button_layout.addWidget(save_button)
+        button_layout.addWidget(clear_button)
+        button_layout.addWidget(cancel_button)
+        main_layout.addLayout(button_layout)
+    
+    def repopulate(self, metadata=None, file_path=None):
+        """Show the given metadata, reusing the widgets built by earlier calls."""
+        from metadata_editor import MetadataEditor
         
-        # Store all inputs
+        self.metadata = metadata or {}
+        self.file_path = file_path
+        self.edited_data = {}
+        self.file_timestamp = None
         self.field_inputs = {}
         self.original_values = {}
         
+        # Get current file timestamp
+        if self.file_path:
+            current_timestamp = MetadataEditor.get_file_timestamp(self.file_path)
+        else:
+            current_timestamp = ""
+        self.current_ts_label.setText(f"Current: {current_timestamp}")
+        self.timestamp_input.setText(current_timestamp)
+        
+        # Take the previous rows out of the grid; they stay pooled for reuse
+        self.scroll_widget.setUpdatesEnabled(False)
+        for widget in self._placed:
+            self.grid_layout.removeWidget(widget)
+            widget.hide()
+        self._placed = []
+        self._pending_sections = []
+        self._fields_used = 0
+        for old_row in range(self._grid_rows):
+            self.grid_layout.setRowMinimumHeight(old_row, 0)
+        
         # Get metadata
         basic_info = self.metadata.get('Basic Information', {})
         exif_data = self.metadata.get('EXIF Data', {})
         image_props = self.metadata.get('Image Properties', {})
         
-        # Combine all metadata
-        all_metadata = {**exif_data, **image_props, **basic_info}
-        
-        # Category mapping for smart organization
-        category_keywords = {
-            '📅 Date & Time': ['date', 'time', 'datetime', 'timestamp', 'subsec'],
-            '👤 Creator Info': ['artist', 'author', 'copyright', 'software', 'description', 'maker', 'rights'],
-            '📷 Camera Info': ['make', 'model', 'lens', 'equipment', 'camera', 'serial', 'body'],
-            '🎯 Exposure Settings': ['exposure', 'iso', 'shutter', 'aperture', 'f-number', 'metering', 'program', 'mode', 'speed', 'bias'],
-            '🔍 Focus & Flash': ['focal', 'flash', 'focus', 'distance', 'af', 'auto'],
-            '🎨 Image Properties': ['orientation', 'resolution', 'dpi', 'color', 'saturation', 'contrast', 'brightness', 'white', 'balance', 'compression', 'bits'],
-            '� Location': ['gps', 'latitude', 'longitude', 'altitude', 'location', 'coordinate'],
-            '📝 Additional Info': ['subject', 'keywords', 'comment', 'unique', 'tag', 'category'],
-            '🎬 Media Info': ['duration', 'frame', 'animation', 'loop', 'codec', 'profile'],
-        }
-        
         # Organize fields by category
-        categorized_fields = {cat: [] for cat in category_keywords.keys()}
-        categorized_fields['🔧 Other Fields'] = []
+        categorized_fields = {cat: [] for cat in self.CATEGORY_ORDER}
         
-        # Sort metadata keys into categories
-        for key, value in sorted(all_metadata.items()):
-            if not value or str(value).strip() == '':
+        # Walk the sections without merging them; on duplicate keys the
+        # earlier section wins (basic info, then properties, then EXIF)
+        seen = set()
+        for key, value in chain(basic_info.items(), image_props.items(), exif_data.items()):
+            if key in seen:
+                continue
+            seen.add(key)
+            if not value:
+                continue
+            # Stringify once; the stripped text is what the rows display and edit
+            value = str(value).strip()
+            if not value:
                 continue
-                
-            categorized = False
-            key_lower = key.lower()
-            
-            for category, keywords in category_keywords.items():
-                if any(kw in key_lower for kw in keywords):
-                    categorized_fields[category].append((key, value))
-                    categorized = False
-                    break
             
-            if not categorized:
-                categorized_fields['🔧 Other Fields'].append((key, value))
+            categorized_fields[self._category_for(key)].append((key, value))
         
-        # Display categorized fields
+        for fields in categorized_fields.values():
+            fields.sort(key=lambda kv: kv[0])
+        
+        # Display categorized fields; rows get widgets only once scrolled into view
+        row = 0
+        headers_used = 0
         for category, fields in categorized_fields.items():
             if not fields:
                 continue
             
             # Add category header
-            category_label = QLabel(category)
-            category_font = QFont('System', 12)
-            category_font.setBold(True)
-            category_label.setFont(category_font)
-            category_label.setStyleSheet("color: #2c3e50; margin-top: 10px;")
-            form_layout.addRow(category_label, QLabel())
+            category_label = self._header_label(headers_used)
+            headers_used += 1
+            category_label.setText(category)
+            self._place(category_label, row, 0, 1, 3)
+            row += 1
             
-            # Add fields
-            for field_key, field_value in sorted(fields):
-                # Clean up field display name
-                display_label = field_key.replace('_', ' ')
-                
-                # Store original value
-                original_str = str(field_value).strip() if field_value else ''
-                if not original_str:
-                    original_str = '[Not set]'
-                
-                # Truncate very long values
-                display_value = original_str if len(original_str) < 80 else original_str[:77] + '...'
-                
-                # Create container
-                field_container = QWidget()
-                field_layout = QVBoxLayout(field_container)
-                field_layout.setContentsMargins(0, 0, 0, 0)
-                field_layout.setSpacing(2)
-                
-                # Original value label
-                original_label = QLabel(f"Original: {display_value}")
-                original_label_font = QFont('System', 9)
-                original_label_font.setItalic(True)
-                original_label.setFont(original_label_font)
-                original_label.setStyleSheet("color: #999;")
-                original_label.setWordWrap(True)
-                field_layout.addWidget(original_label)
-                
-                # Input field
-                input_field = QLineEdit()
-                if field_value:
-                    input_field.setText(str(field_value).strip())
-                input_field.setMinimumHeight(28)
-                input_field.setPlaceholderText(f"Edit {display_label.lower()}")
-                self.field_inputs[field_key] = input_field
-                field_layout.addWidget(input_field)
-                
-                # Add to form
-                form_layout.addRow(QLabel(display_label), field_container)
+            # Reserve the field rows at an estimated height until they are built
+            for field_row in range(row, row + len(fields)):
+                self.grid_layout.setRowMinimumHeight(field_row, self.ESTIMATED_ROW_HEIGHT)
+            self._pending_sections.append((category_label, row, fields))
+            row += len(fields)
             
             # Add spacing
-            form_layout.addRow(QLabel(''), QLabel(''))
-        
-        scroll_area.setWidget(scroll_widget)
-        main_layout.addWidget(scroll_area)
-        
-        # Buttons
-        button_layout = QHBoxLayout()
-        
-        save_button = QPushButton('💾 Save All Changes')
-        save_button.clicked.connect(self.save_changes)
-        save_button.setMinimumHeight(35)
-        save_button.setFont(QFont('System', 11))
-        
-        clear_button = QPushButton('🔄 Clear Empty Fields')
-        clear_button.clicked.connect(self.clear_empty_fields)
-        clear_button.setMinimumHeight(35)
-        clear_button.setFont(QFont('System', 11))
-        
-        cancel_button = QPushButton('❌ Cancel')
-        cancel_button.clicked.connect(self.reject)
-        cancel_button.setMinimumHeight(35)
-        cancel_button.setFont(QFont('System', 11))
+            self.grid_layout.setRowMinimumHeight(row, 10)
+            row += 1
+        
+        self._grid_rows = row
+        self.scroll_widget.setUpdatesEnabled(True)
+        self.scroll_area.verticalScrollBar().setValue(0)
+        if self.isVisible():
+            QTimer.singleShot(0, self._materialize_visible)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Header geometry is only settled once the layout has run
+        QTimer.singleShot(0, self._materialize_visible)
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._materialize_visible()
+    
+    def _materialize_visible(self):
+        """Build the field rows of every pending category that overlaps the viewport."""
+        if not self._pending_sections:
+            return
         
-        button_layout.addWidget(save_button)
-        button_layout.addWidget(clear_button)
-        button_layout.addWidget(cancel_button)
-        main_layout.addLayout(button_layout)
+        top = self.scroll_area.verticalScrollBar().value()
+        bottom = top + self.scroll_area.viewport().height()
+        
+        remaining = []
+        self.scroll_widget.setUpdatesEnabled(False)
+        for section in self._pending_sections:
+            category_label, first_row, fields = section
+            section_top = category_label.geometry().top()
+            section_bottom = category_label.geometry().bottom() + len(fields) * self.ESTIMATED_ROW_HEIGHT
+            if section_bottom >= top and section_top <= bottom:
+                self._materialize_section(first_row, fields)
+            else:
+                remaining.append(section)
+        self._pending_sections = remaining
+        self.scroll_widget.setUpdatesEnabled(True)
+    
+    def _materialize_section(self, first_row: int, fields):
+        """Fill one category's reserved rows with pooled widgets."""
+        for row, (field_key, field_value) in enumerate(fields, first_row):
+            # Clean up field display name
+            display_label = field_key.replace('_', ' ')
+            
+            # Truncate very long values
+            display_value = field_value if len(field_value) < 80 else field_value[:77] + '...'
+            
+            name_label, original_label, input_field = self._field_row(self._fields_used)
+            self._fields_used += 1
+            name_label.setText(display_label)
+            original_label.setText(f"Original: {display_value}")
+            input_field.setText(field_value)
+            input_field.setPlaceholderText(f"Edit {display_label.lower()}")
+            self.field_inputs[field_key] = input_field
+            
+            # Label, original value and input share one grid row
+            self.grid_layout.setRowMinimumHeight(row, 0)
+            self._place(name_label, row, 0)
+            self._place(original_label, row, 1)
+            self._place(input_field, row, 2)
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _category_for(key: str) -> str:
+        """Return the section a metadata key belongs in; tag names repeat across files."""
+        key_lower = key.lower()
+        for keyword, category in EditMetadataDialog._KEYWORD_CATEGORIES:
+            if keyword in key_lower:
+                return category
+        return EditMetadataDialog.OTHER_CATEGORY
+    
+    def _header_label(self, index: int) -> QLabel:
+        """Return the pooled category header at index, creating it if needed."""
+        if index == len(self._header_pool):
+            category_label = QLabel(self.scroll_widget)
+            category_label.setFont(_font('System', 12, bold=True))
+            category_label.setStyleSheet("color: #2c3e50; margin-top: 10px;")
+            self._header_pool.append(category_label)
+        return self._header_pool[index]
+    
+    def _field_row(self, index: int):
+        """Return the pooled (name, original, input) widgets at index, creating them if needed."""
+        if index == len(self._field_pool):
+            name_label = QLabel(self.scroll_widget)
+            
+            # Original value label
+            original_label = QLabel(self.scroll_widget)
+            original_label.setFont(_font('System', 9, italic=True))
+            original_label.setStyleSheet("color: #999;")
+            original_label.setWordWrap(True)
+            
+            # Input field
+            input_field = QLineEdit(self.scroll_widget)
+            input_field.setMinimumHeight(28)
+            
+            self._field_pool.append((name_label, original_label, input_field))
+        return self._field_pool[index]
+    
+    def _place(self, widget, row: int, column: int, row_span: int = 1, column_span: int = 1):
+        """Put a pooled widget into the grid and show it."""
+        self.grid_layout.addWidget(widget, row, column, row_span, column_span)
+        widget.show()
+        self._placed.append(widget)
     
     def clear_empty_fields(self):
         """Clear all empty input fields."""
@@ -233,6 +469,9 @@ class EditMetadataDialog(QDialog):
     
     def save_changes(self):
         """Collect edited data and close dialog."""
+        # Rows never scrolled into view were not built and still hold their original values
+        for _, _, fields in self._pending_sections:
+            self.edited_data.update(fields)
         for field, input_field in self.field_inputs.items():
             value = input_field.text().strip()
             if value:  # Only save non-empty fields
@@ -254,6 +493,26 @@ class EditMetadataDialog(QDialog):
 
 class MetadataViewer(QMainWindow):
     """Main application window for viewing image metadata."""
+    
+    IMAGE_FILE_FILTER = 'Image Files (*.jpg *.jpeg *.png *.gif *.bmp *.tiff *.tif *.webp);;All Files (*)'
+    
+    # (attribute, action name, key sequence, slot name)
+    SHORTCUTS = (
+        ('open_shortcut', 'Open', 'Ctrl+O', 'open_image'),
+        ('edit_shortcut', 'Edit', 'Ctrl+E', 'edit_metadata'),
+        ('export_shortcut', 'Export', 'Ctrl+S', 'export_image'),
+        ('dark_mode_shortcut', 'Dark Mode', 'Ctrl+D', 'toggle_dark_mode'),
+    )
+    
+    # (label, slot name) for the Advanced menu; None marks a separator
+    ADVANCED_MENU = (
+        ('🗺️ GPS Info', 'show_gps_info'),
+        ('🔐 Privacy Report', 'show_privacy_report'),
+        ('🛡️ Privacy Mode', 'enable_privacy_mode'),
+        ('📷 Image Operations', 'show_image_operations'),
+        (None, None),
+        ('🌓 Dark Mode (Ctrl+D)', 'toggle_dark_mode'),
+    )
 
     def __init__(self):
         super().__init__()
@@ -262,7 +521,25 @@ class MetadataViewer(QMainWindow):
         self.image_list = []
         self.current_index = 0
         self.dark_mode = False
+        self._current_stylesheet = None
         self.tagging_system = TaggingSystem()
+        self._pending_metadata = {}
+        self._tab_dirty = {0: False, 1: False, 2: False}
+        self._load_gen = 0
+        
+        # Separate, small pool so prefetching never delays the visible image
+        self._prefetch_pool = QThreadPool(self)
+        self._prefetch_pool.setMaxThreadCount(2)
+        self._edit_dialog = None
+        self._current_metadata = None
+        self._reload_pending = False
+        
+        # Coalesce rapid selection changes (e.g. holding an arrow key) into one load
+        self._pending_path = None
+        self._sel_timer = QTimer(self)
+        self._sel_timer.setSingleShot(True)
+        self._sel_timer.setInterval(120)
+        self._sel_timer.timeout.connect(self._do_load_selected)
         
         self.init_ui()
         self.setWindowTitle('🖼️ Metadata Expert - Professional Image Metadata Manager')
@@ -274,36 +551,31 @@ class MetadataViewer(QMainWindow):
 
     def setup_keyboard_shortcuts(self):
         """Setup keyboard shortcuts."""
-        self.open_shortcut = QAction("Open", self)
-        self.open_shortcut.setShortcut("Ctrl+O")
-        self.open_shortcut.triggered.connect(self.open_image)
-        self.addAction(self.open_shortcut)
-        
-        self.edit_shortcut = QAction("Edit", self)
-        self.edit_shortcut.setShortcut("Ctrl+E")
-        self.edit_shortcut.triggered.connect(self.edit_metadata)
-        self.addAction(self.edit_shortcut)
-        
-        self.export_shortcut = QAction("Export", self)
-        self.export_shortcut.setShortcut("Ctrl+S")
-        self.export_shortcut.triggered.connect(self.export_image)
-        self.addAction(self.export_shortcut)
-        
-        self.dark_mode_shortcut = QAction("Dark Mode", self)
-        self.dark_mode_shortcut.setShortcut("Ctrl+D")
-        self.dark_mode_shortcut.triggered.connect(self.toggle_dark_mode)
-        self.addAction(self.dark_mode_shortcut)
+        for attr, name, sequence, slot in self.SHORTCUTS:
+            action = QAction(name, self)
+            action.setShortcut(sequence)
+            action.triggered.connect(getattr(self, slot))
+            self.addAction(action)
+            setattr(self, attr, action)
 
     def toggle_dark_mode(self):
         """Toggle dark/light mode."""
         self.dark_mode = not self.dark_mode
         
+        # Status bar rather than a modal box, so the shortcut can be pressed repeatedly
         if self.dark_mode:
-            self.setStyleSheet(self.get_dark_stylesheet())
-            QMessageBox.information(self, "Dark Mode", "Dark mode enabled (Ctrl+D to toggle)")
+            self.apply_stylesheet(self.get_dark_stylesheet())
+            self.statusBar().showMessage("Dark mode enabled (Ctrl+D to toggle)", 3000)
         else:
-            self.setStyleSheet(self.get_light_stylesheet())
-            QMessageBox.information(self, "Light Mode", "Light mode enabled (Ctrl+D to toggle)")
+            self.apply_stylesheet(self.get_light_stylesheet())
+            self.statusBar().showMessage("Light mode enabled (Ctrl+D to toggle)", 3000)
+    
+    def apply_stylesheet(self, stylesheet: str):
+        """Set the window stylesheet unless it is already applied; each change re-polishes every widget."""
+        if stylesheet == self._current_stylesheet:
+            return
+        self._current_stylesheet = stylesheet
+        self.setStyleSheet(stylesheet)
     
     def get_light_stylesheet(self) -> str:
         """Get light mode stylesheet."""
@@ -340,13 +612,13 @@ class MetadataViewer(QMainWindow):
             QPushButton:pressed {
                 background-color: #003d7a;
             }
-            QListWidget, QListView {
+            QListWidget, QListView, QTableView {
                 background-color: #ffffff;
                 color: #000000;
                 border: 1px solid #cccccc;
                 alternate-background-color: #f5f5f5;
             }
-            QListWidget::item:selected {
+            QListWidget::item:selected, QTableView::item:selected {
                 background-color: #0066cc;
                 color: #ffffff;
             }
@@ -396,6 +668,14 @@ class MetadataViewer(QMainWindow):
             QScrollBar::handle:vertical:hover {
                 background-color: #0052a3;
             }
+            QFrame#previewFrame, QFrame#previewFrame QLabel {
+                background-color: #f0f0f0;
+                border-radius: 5px;
+            }
+            QLabel#previewLabel {
+                color: #666;
+                font-size: 14px;
+            }
         """
     
     def get_dark_stylesheet(self) -> str:
@@ -433,13 +713,13 @@ class MetadataViewer(QMainWindow):
             QPushButton:pressed {
                 background-color: #0052a3;
             }
-            QListWidget, QListView {
+            QListWidget, QListView, QTableView {
                 background-color: #2d2d2d;
                 color: #ffffff;
                 border: 1px solid #444444;
                 alternate-background-color: #1f1f1f;
             }
-            QListWidget::item:selected {
+            QListWidget::item:selected, QTableView::item:selected {
                 background-color: #0066cc;
                 color: #ffffff;
             }
@@ -489,12 +769,20 @@ class MetadataViewer(QMainWindow):
             QScrollBar::handle:vertical:hover {
                 background-color: #0084ff;
             }
+            QFrame#previewFrame, QFrame#previewFrame QLabel {
+                background-color: #f0f0f0;
+                border-radius: 5px;
+            }
+            QLabel#previewLabel {
+                color: #666;
+                font-size: 14px;
+            }
         """
 
     def init_ui(self):
         """Initialize the user interface."""
         # Apply light mode stylesheet by default
-        self.setStyleSheet(self.get_light_stylesheet())
+        self.apply_stylesheet(self.get_light_stylesheet())
         
         # Create central widget
         central_widget = QWidget()
@@ -516,22 +804,22 @@ class MetadataViewer(QMainWindow):
         open_button = QPushButton('📁 Open Image')
         open_button.clicked.connect(self.open_image)
         open_button.setMinimumHeight(35)
-        open_button.setFont(QFont('System', 10))
+        open_button.setFont(_font('System', 10))
         
         browse_button = QPushButton('📂 Browse Folder')
         browse_button.clicked.connect(self.browse_folder)
         browse_button.setMinimumHeight(35)
-        browse_button.setFont(QFont('System', 10))
+        browse_button.setFont(_font('System', 10))
         
         edit_button = QPushButton('✏️ Edit Metadata')
         edit_button.clicked.connect(self.edit_metadata)
         edit_button.setMinimumHeight(35)
-        edit_button.setFont(QFont('System', 10))
+        edit_button.setFont(_font('System', 10))
         
         export_button = QPushButton('💾 Export/Save')
         export_button.clicked.connect(self.export_image)
         export_button.setMinimumHeight(35)
-        export_button.setFont(QFont('System', 10))
+        export_button.setFont(_font('System', 10))
         
         button_layout.addWidget(open_button)
         button_layout.addWidget(browse_button)
@@ -541,16 +829,15 @@ class MetadataViewer(QMainWindow):
         # Advanced menu button
         advanced_menu = QPushButton('⚙️ Advanced')
         advanced_menu.setMinimumHeight(35)
-        advanced_menu.setFont(QFont('System', 10))
+        advanced_menu.setFont(_font('System', 10))
         
         # Create menu
         menu = QMenu(self)
-        menu.addAction('🗺️ GPS Info', self.show_gps_info)
-        menu.addAction('🔐 Privacy Report', self.show_privacy_report)
-        menu.addAction('🛡️ Privacy Mode', self.enable_privacy_mode)
-        menu.addAction('📷 Image Operations', self.show_image_operations)
-        menu.addSeparator()
-        menu.addAction('🌓 Dark Mode (Ctrl+D)', self.toggle_dark_mode)
+        for label, slot in self.ADVANCED_MENU:
+            if label is None:
+                menu.addSeparator()
+            else:
+                menu.addAction(label, getattr(self, slot))
         
         advanced_menu.setMenu(menu)
         button_layout.addWidget(advanced_menu)
@@ -559,21 +846,23 @@ class MetadataViewer(QMainWindow):
         
         # File list
         self.file_list = QListWidget()
-        self.file_list.itemClicked.connect(self.on_file_selected)
+        self.file_list.setUniformItemSizes(True)
+        self.file_list.currentItemChanged.connect(self.on_file_selected)
         left_layout.addWidget(QLabel('Images in Folder:'))
         left_layout.addWidget(self.file_list)
         
         # Image preview area
         left_layout.addWidget(QLabel('Preview:'))
         preview_frame = QFrame()
-        preview_frame.setStyleSheet("background-color: #f0f0f0; border-radius: 5px;")
+        # Styled by the window stylesheet; a per-widget sheet costs its own style proxy
+        preview_frame.setObjectName('previewFrame')
         preview_layout = QVBoxLayout(preview_frame)
         preview_layout.setContentsMargins(5, 5, 5, 5)
         
         self.preview_label = QLabel('No image selected')
         self.preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.preview_label.setMinimumHeight(250)
-        self.preview_label.setStyleSheet("color: #666; font-size: 14px;")
+        self.preview_label.setObjectName('previewLabel')
         preview_layout.addWidget(self.preview_label)
         
         left_layout.addWidget(preview_frame)
@@ -589,16 +878,17 @@ class MetadataViewer(QMainWindow):
         self.tabs = QTabWidget()
         
         # Basic Info Tab
-        self.basic_tab = QListWidget()
+        self.basic_tab = self.create_metadata_view()
         self.tabs.addTab(self.basic_tab, '📄 Basic Info')
         
         # EXIF Data Tab
-        self.exif_tab = QListWidget()
+        self.exif_tab = self.create_metadata_view()
         self.tabs.addTab(self.exif_tab, '📷 EXIF Data')
         
         # Properties Tab
-        self.properties_tab = QListWidget()
+        self.properties_tab = self.create_metadata_view()
         self.tabs.addTab(self.properties_tab, '⚙️ Properties')
+        self.tabs.currentChanged.connect(self._fill_tab)
         
         right_layout.addWidget(self.tabs)
         
@@ -618,7 +908,7 @@ class MetadataViewer(QMainWindow):
             self,
             'Open Image',
             str(self.current_directory),
-            'Image Files (*.jpg *.jpeg *.png *.gif *.bmp *.tiff *.tif *.webp);;All Files (*)'
+            self.IMAGE_FILE_FILTER
         )
         
         if file_path:
@@ -640,84 +930,170 @@ class MetadataViewer(QMainWindow):
 
     def load_folder(self, directory: Path):
         """Load all images from a folder."""
-        self.image_list = MetadataParser.find_images_in_directory(directory)
-        self.file_list.clear()
+        from metadata_parser import MetadataParser
         
-        for idx, image_path in enumerate(self.image_list):
-            item = QListWidgetItem(image_path.name)
-            item.setData(Qt.ItemDataRole.UserRole, idx)
-            self.file_list.addItem(item)
+        self.image_list = MetadataParser.find_images_in_directory(directory)
+        self.file_list.setUpdatesEnabled(False)
+        self.file_list.blockSignals(True)
+        try:
+            self.file_list.clear()
+            self.file_list.addItems([image_path.name for image_path in self.image_list])
+        finally:
+            self.file_list.blockSignals(False)
+            self.file_list.setUpdatesEnabled(True)
         
         if self.image_list:
             self.file_list.setCurrentRow(0)
+            # Show the first image right away instead of waiting out the debounce
+            self._sel_timer.stop()
             self.load_image(self.image_list[0])
 
-    def on_file_selected(self, item):
+    def on_file_selected(self, item, previous=None):
         """Handle file selection from the list."""
-        idx = item.data(Qt.ItemDataRole.UserRole)
-        if idx is not None and idx < len(self.image_list):
-            self.load_image(self.image_list[idx])
+        if item is None:
+            return
+        # Rows line up with image_list, so the row is the index
+        idx = self.file_list.row(item)
+        if 0 <= idx < len(self.image_list):
+            self._pending_path = self.image_list[idx]
+            self._sel_timer.start()
+
+    def _do_load_selected(self):
+        """Load the last selected file once the selection has settled."""
+        if self._pending_path is not None:
+            self.load_image(self._pending_path)
 
     def load_image(self, file_path: Path):
         """Load and display image with metadata."""
         self.current_file = file_path
+        self._current_metadata = None
+        
+        # Decode and parse in the thread pool; stale results are dropped by generation
+        self._load_gen += 1
+        worker = LoadWorker(self._load_gen, file_path)
+        worker.signals.finished.connect(self._on_image_loaded)
+        QThreadPool.globalInstance().start(worker)
+
+    def _schedule_reload(self):
+        """Reload the current image once the event loop is idle; repeated requests coalesce."""
+        # The file changed on disk, so the parsed metadata is stale now
+        self._current_metadata = None
+        if not self._reload_pending:
+            self._reload_pending = True
+            QTimer.singleShot(0, self._do_reload)
+
+    def _do_reload(self):
+        """Run the reload queued by _schedule_reload."""
+        self._reload_pending = False
+        if self.current_file:
+            self.load_image(self.current_file)
+
+    def _on_image_loaded(self, generation: int, image: QImage, metadata: dict):
+        """Show the preview and metadata produced by a LoadWorker."""
+        if generation != self._load_gen:
+            return
         
         # Update preview
-        pixmap = QPixmap(str(file_path))
-        if not pixmap.isNull():
-            scaled = pixmap.scaledToHeight(250, Qt.TransformationMode.SmoothTransformation)
-            self.preview_label.setPixmap(scaled)
+        if not image.isNull():
+            self.preview_label.setPixmap(QPixmap.fromImage(image))
         else:
             self.preview_label.setText('Cannot load image preview')
         
-        # Load and display metadata
-        metadata = MetadataParser.get_all_metadata(file_path)
+        # Display metadata; kept so Edit does not parse the file again
+        self._current_metadata = metadata
         self.display_metadata(metadata)
+        
+        self._prefetch_neighbours()
+
+    def _prefetch_neighbours(self):
+        """Parse the images either side of the current one into the caches."""
+        row = self.file_list.currentRow()
+        if not (0 <= row < len(self.image_list)) or self.image_list[row] != self.current_file:
+            return
+        neighbours = [self.image_list[idx] for idx in (row + 1, row - 1)
+                      if 0 <= idx < len(self.image_list)]
+        if neighbours:
+            self._prefetch_pool.clear()
+            self._prefetch_pool.start(PrefetchWorker(neighbours))
 
     def display_metadata(self, metadata: dict):
         """Display metadata in the tabs."""
-        # Clear previous data
-        self.basic_tab.clear()
-        self.exif_tab.clear()
-        self.properties_tab.clear()
-        
-        # Display Basic Information
-        basic_info = metadata.get('Basic Information', {})
-        for key, value in basic_info.items():
-            self.add_metadata_item(self.basic_tab, key, value)
-        
-        # Display EXIF Data
-        exif_data = metadata.get('EXIF Data', {})
-        if exif_data:
-            for key, value in sorted(exif_data.items()):
-                self.add_metadata_item(self.exif_tab, key, value)
-        else:
-            self.exif_tab.addItem('No EXIF data found')
-        
-        # Display Image Properties
-        properties = metadata.get('Image Properties', {})
-        for key, value in properties.items():
-            self.add_metadata_item(self.properties_tab, key, value)
+        # Only the visible tab is filled now; the rest wait for currentChanged
+        self._pending_metadata = metadata
+        self._tab_dirty = {0: True, 1: True, 2: True}
+        self._fill_tab(self.tabs.currentIndex())
 
-    @staticmethod
-    def add_metadata_item(list_widget: QListWidget, key: str, value):
-        """Add a metadata item to the list widget."""
-        text = f"{key}: {value}"
-        item = QListWidgetItem(text)
-        item.setFont(QFont('Menlo', 10))
-        list_widget.addItem(item)
+    def _fill_tab(self, idx: int):
+        """Populate a metadata tab from the pending metadata if it is stale."""
+        if not self._tab_dirty.get(idx):
+            return
+        self._tab_dirty[idx] = False
+        metadata = self._pending_metadata
+        
+        if idx == 0:
+            # Display Basic Information
+            basic_info = metadata.get('Basic Information', {})
+            self.basic_tab.model().set_rows(basic_info.items())
+        elif idx == 1:
+            # Display EXIF Data
+            exif_data = metadata.get('EXIF Data', {})
+            if exif_data:
+                self.exif_tab.model().set_rows(sorted(exif_data.items()))
+            else:
+                self.exif_tab.model().set_rows([('No EXIF data found', '')])
+        elif idx == 2:
+            # Display Image Properties
+            properties = metadata.get('Image Properties', {})
+            self.properties_tab.model().set_rows(properties.items())
+
+    def create_metadata_view(self) -> QTableView:
+        """Create a read-only field/value table backed by a MetadataModel."""
+        view = QTableView()
+        view.setModel(MetadataModel(view))
+        view.setFont(_font('Menlo', 10))
+        view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        view.setWordWrap(False)
+        view.setShowGrid(False)
+        
+        # Fixed row heights so the view never measures rows it is not painting
+        view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        view.verticalHeader().hide()
+        view.horizontalHeader().setStretchLastSection(True)
+        view.setColumnWidth(0, 260)
+        return view
+
+    def _run_task(self, task, on_done):
+        """Run task in the thread pool and call on_done(ok) on the GUI thread."""
+        worker = TaskWorker(task)
+        worker.signals.finished.connect(on_done)
+        QThreadPool.globalInstance().start(worker)
+
+    def _metadata(self) -> dict:
+        """Return the current file's metadata, reusing what load_image already parsed."""
+        if self._current_metadata is None:
+            from metadata_parser import MetadataParser
+            
+            self._current_metadata = MetadataParser.get_all_metadata(self.current_file)
+        return self._current_metadata
 
     def edit_metadata(self):
         """Open dialog to edit metadata."""
+        from metadata_editor import MetadataEditor
+        
         if not self.current_file:
             QMessageBox.warning(self, 'Warning', 'Please select an image first')
             return
         
         # Get current metadata
-        metadata = MetadataParser.get_all_metadata(self.current_file)
+        metadata = self._metadata()
         
-        # Open edit dialog with file path
-        dialog = EditMetadataDialog(self, metadata, self.current_file)
+        # Open edit dialog with file path; built once, then refilled on later opens
+        if self._edit_dialog is None:
+            self._edit_dialog = EditMetadataDialog(self, metadata, self.current_file)
+        else:
+            self._edit_dialog.repopulate(metadata, self.current_file)
+        dialog = self._edit_dialog
         if dialog.exec() == QDialog.DialogCode.Accepted:
             edited_data = dialog.get_edited_data()
             file_timestamp = dialog.get_file_timestamp()
@@ -744,9 +1120,9 @@ class MetadataViewer(QMainWindow):
                 msg = f'✅ Metadata & properties updated successfully!\nBackup saved as: {backup_path.name}'
                 if file_timestamp and file_timestamp.strip():
                     msg += f'\nFile timestamp changed to: {file_timestamp}'
+                # Reload image to show updated metadata; runs behind the message box
+                self._schedule_reload()
                 QMessageBox.information(self, 'Success', msg)
-                # Reload image to show updated metadata
-                self.load_image(self.current_file)
             else:
                 QMessageBox.critical(self, 'Error', 'Failed to save metadata')
                 # Restore from backup
@@ -795,31 +1171,40 @@ class MetadataViewer(QMainWindow):
 
     def export_image_copy(self, parent_dialog):
         """Export a copy of the image."""
+        from metadata_editor import MetadataEditor
+        
         export_path, _ = QFileDialog.getSaveFileName(
             self,
             'Export Image',
             str(self.current_directory / f"exported_{self.current_file.name}"),
-            'Image Files (*.jpg *.jpeg *.png *.gif *.bmp *.tiff *.tif *.webp);;All Files (*)'
+            self.IMAGE_FILE_FILTER
         )
         
         if export_path:
-            if MetadataEditor.export_image_copy(self.current_file, Path(export_path)):
-                QMessageBox.information(self, 'Success', f'Image exported successfully!\n{export_path}')
-            else:
-                QMessageBox.critical(self, 'Error', 'Failed to export image')
+            source = self.current_file
+            
+            def on_done(ok):
+                if ok:
+                    QMessageBox.information(self, 'Success', f'Image exported successfully!\n{export_path}')
+                else:
+                    QMessageBox.critical(self, 'Error', 'Failed to export image')
+            
+            self._run_task(lambda: MetadataEditor.export_image_copy(source, Path(export_path)), on_done)
             parent_dialog.close()
 
     def export_metadata_text(self, parent_dialog):
         """Export metadata to a text file."""
+        from metadata_editor import MetadataEditor
+        
         export_path, _ = QFileDialog.getSaveFileName(
             self,
             'Export Metadata',
             str(self.current_directory / f"{self.current_file.stem}_metadata.txt"),
-            'Text Files (*.txt);;All Files (*)'
+            'Text Files (*.txt);;JSON Files (*.json);;All Files (*)'
         )
         
         if export_path:
-            metadata = MetadataParser.get_all_metadata(self.current_file)
+            metadata = self._metadata()
             if MetadataEditor.export_metadata_to_file(self.current_file, metadata, Path(export_path)):
                 QMessageBox.information(self, 'Success', f'Metadata exported successfully!\n{export_path}')
             else:
@@ -828,26 +1213,35 @@ class MetadataViewer(QMainWindow):
 
     def export_without_exif(self, parent_dialog):
         """Export image without EXIF data."""
+        from metadata_editor import MetadataEditor
+        
         export_path, _ = QFileDialog.getSaveFileName(
             self,
             'Export Image Without Metadata',
             str(self.current_directory / f"no_exif_{self.current_file.name}"),
-            'Image Files (*.jpg *.jpeg *.png *.gif *.bmp *.tiff *.tif *.webp);;All Files (*)'
+            self.IMAGE_FILE_FILTER
         )
         
         if export_path:
-            if MetadataEditor.remove_exif_data(self.current_file, Path(export_path)):
-                QMessageBox.information(
-                    self, 
-                    'Success', 
-                    f'Image exported without metadata!\n{export_path}'
-                )
-            else:
-                QMessageBox.critical(self, 'Error', 'Failed to remove metadata')
+            source = self.current_file
+            
+            def on_done(ok):
+                if ok:
+                    QMessageBox.information(
+                        self, 
+                        'Success', 
+                        f'Image exported without metadata!\n{export_path}'
+                    )
+                else:
+                    QMessageBox.critical(self, 'Error', 'Failed to remove metadata')
+            
+            self._run_task(lambda: MetadataEditor.remove_exif_data(source, Path(export_path)), on_done)
             parent_dialog.close()
 
     def show_gps_info(self):
         """Show GPS information for current image."""
+        from gps_handler import GPSHandler
+        
         if not self.current_file:
             QMessageBox.warning(self, 'Warning', 'Please select an image first')
             return
@@ -869,6 +1263,8 @@ class MetadataViewer(QMainWindow):
     
     def show_privacy_report(self):
         """Show privacy report for current image."""
+        from privacy_handler import PrivacyHandler
+        
         if not self.current_file:
             QMessageBox.warning(self, 'Warning', 'Please select an image first')
             return
@@ -887,6 +1283,9 @@ class MetadataViewer(QMainWindow):
     
     def enable_privacy_mode(self):
         """Enable privacy mode to remove sensitive data."""
+        from metadata_editor import MetadataEditor
+        from privacy_handler import PrivacyHandler
+        
         if not self.current_file:
             QMessageBox.warning(self, 'Warning', 'Please select an image first')
             return
@@ -897,16 +1296,22 @@ class MetadataViewer(QMainWindow):
             QMessageBox.critical(self, 'Error', 'Failed to create backup')
             return
         
-        if PrivacyHandler.privacy_mode(self.current_file):
-            QMessageBox.information(
-                self,
-                'Success',
-                'Privacy mode enabled! Sensitive data removed.\nBackup saved as: ' + backup_path.name
-            )
-            self.load_image(self.current_file)
-        else:
-            QMessageBox.critical(self, 'Error', 'Failed to enable privacy mode')
-            PrivacyHandler.remove_gps_data(self.current_file)
+        file_path = self.current_file
+        
+        def on_done(ok):
+            if ok:
+                if file_path == self.current_file:
+                    self._schedule_reload()
+                QMessageBox.information(
+                    self,
+                    'Success',
+                    'Privacy mode enabled! Sensitive data removed.\nBackup saved as: ' + backup_path.name
+                )
+            else:
+                QMessageBox.critical(self, 'Error', 'Failed to enable privacy mode')
+                PrivacyHandler.remove_gps_data(file_path)
+        
+        self._run_task(lambda: PrivacyHandler.privacy_mode(file_path), on_done)
     
     def show_image_operations(self):
         """Show image operations dialog."""
@@ -949,20 +1354,25 @@ class MetadataViewer(QMainWindow):
     
     def resize_image_dialog(self):
         """Show resize image dialog."""
+        from image_operations import ImageOperations
+        
         dialog = QDialog(self)
         dialog.setWindowTitle('Resize Image')
         dialog.setGeometry(400, 400, 300, 200)
         
         layout = QFormLayout(dialog)
         
+        # Start from the image's own size; the info is cached per file version
+        info = ImageOperations.get_image_info(self.current_file)
+        
         width_input = QSpinBox()
         width_input.setRange(1, 10000)
-        width_input.setValue(800)
+        width_input.setValue(info.get('width', 800))
         layout.addRow('Width (px):', width_input)
         
         height_input = QSpinBox()
         height_input.setRange(1, 10000)
-        height_input.setValue(600)
+        height_input.setValue(info.get('height', 600))
         layout.addRow('Height (px):', height_input)
         
         maintain_aspect = QCheckBox('Maintain Aspect Ratio')
@@ -974,13 +1384,21 @@ class MetadataViewer(QMainWindow):
         cancel_button = QPushButton('Cancel')
         
         def do_resize():
-            output_path = self.current_file.parent / f"resized_{self.current_file.name}"
-            if ImageOperations.resize_image(self.current_file, width_input.value(), 
-                                           height_input.value(), maintain_aspect.isChecked(), output_path):
-                QMessageBox.information(self, 'Success', f'Image resized!\nSaved as: resized_{self.current_file.name}')
-                dialog.close()
-            else:
-                QMessageBox.critical(self, 'Error', 'Failed to resize image')
+            source = self.current_file
+            output_path = source.parent / f"resized_{source.name}"
+            width, height, keep_aspect = width_input.value(), height_input.value(), maintain_aspect.isChecked()
+            
+            def on_done(ok):
+                resize_button.setEnabled(True)
+                if ok:
+                    QMessageBox.information(self, 'Success', f'Image resized!\nSaved as: {output_path.name}')
+                    dialog.close()
+                else:
+                    QMessageBox.critical(self, 'Error', 'Failed to resize image')
+            
+            resize_button.setEnabled(False)
+            self._run_task(lambda: ImageOperations.resize_image(source, width, height, keep_aspect, output_path),
+                           on_done)
         
         resize_button.clicked.connect(do_resize)
         cancel_button.clicked.connect(dialog.close)
@@ -993,6 +1411,8 @@ class MetadataViewer(QMainWindow):
     
     def compress_image_dialog(self):
         """Show compress image dialog."""
+        from image_operations import ImageOperations
+        
         dialog = QDialog(self)
         dialog.setWindowTitle('Compress Image')
         dialog.setGeometry(400, 400, 300, 150)
@@ -1009,12 +1429,20 @@ class MetadataViewer(QMainWindow):
         cancel_button = QPushButton('Cancel')
         
         def do_compress():
-            output_path = self.current_file.parent / f"compressed_{self.current_file.name}"
-            if ImageOperations.compress_image(self.current_file, quality_input.value(), output_path):
-                QMessageBox.information(self, 'Success', f'Image compressed!\nSaved as: compressed_{self.current_file.name}')
-                dialog.close()
-            else:
-                QMessageBox.critical(self, 'Error', 'Failed to compress image')
+            source = self.current_file
+            output_path = source.parent / f"compressed_{source.name}"
+            quality = quality_input.value()
+            
+            def on_done(ok):
+                compress_button.setEnabled(True)
+                if ok:
+                    QMessageBox.information(self, 'Success', f'Image compressed!\nSaved as: {output_path.name}')
+                    dialog.close()
+                else:
+                    QMessageBox.critical(self, 'Error', 'Failed to compress image')
+            
+            compress_button.setEnabled(False)
+            self._run_task(lambda: ImageOperations.compress_image(source, quality, output_path), on_done)
         
         compress_button.clicked.connect(do_compress)
         cancel_button.clicked.connect(dialog.close)
@@ -1027,6 +1455,8 @@ class MetadataViewer(QMainWindow):
     
     def convert_format_dialog(self):
         """Show format conversion dialog."""
+        from image_operations import ImageOperations
+        
         dialog = QDialog(self)
         dialog.setWindowTitle('Convert Format')
         dialog.setGeometry(400, 400, 300, 150)
@@ -1042,12 +1472,20 @@ class MetadataViewer(QMainWindow):
         cancel_button = QPushButton('Cancel')
         
         def do_convert():
-            output_path = self.current_file.parent / f"{self.current_file.stem}.{format_combo.currentText()}"
-            if ImageOperations.convert_format(self.current_file, format_combo.currentText(), output_path):
-                QMessageBox.information(self, 'Success', f'Image converted!\nSaved as: {output_path.name}')
-                dialog.close()
-            else:
-                QMessageBox.critical(self, 'Error', 'Failed to convert image')
+            source = self.current_file
+            target_format = format_combo.currentText()
+            output_path = source.parent / f"{source.stem}.{target_format}"
+            
+            def on_done(ok):
+                convert_button.setEnabled(True)
+                if ok:
+                    QMessageBox.information(self, 'Success', f'Image converted!\nSaved as: {output_path.name}')
+                    dialog.close()
+                else:
+                    QMessageBox.critical(self, 'Error', 'Failed to convert image')
+            
+            convert_button.setEnabled(False)
+            self._run_task(lambda: ImageOperations.convert_format(source, target_format, output_path), on_done)
         
         convert_button.clicked.connect(do_convert)
         cancel_button.clicked.connect(dialog.close)
@@ -1060,6 +1498,8 @@ class MetadataViewer(QMainWindow):
     
     def show_image_info(self):
         """Show comprehensive image information."""
+        from image_operations import ImageOperations
+        
         if not self.current_file:
             return
         
@@ -1079,20 +1519,13 @@ class MetadataViewer(QMainWindow):
     @staticmethod
     def create_icon():
         """Create a simple icon for the window."""
-        pixmap = QPixmap(32, 32)
-        pixmap.fill(Qt.GlobalColor.transparent)
-        return QIcon(pixmap)
+        # A transparent pixmap renders the same as a null icon, without the allocation
+        return QIcon()
 
 
 def main():
     """Main entry point."""
-    app_instance = None
-    try:
-        app_instance = __import__('PyQt6.QtWidgets').QtWidgets.QApplication.instance()
-        if app_instance is None:
-            app_instance = __import__('PyQt6.QtWidgets').QtWidgets.QApplication(sys.argv)
-    except:
-        app_instance = __import__('PyQt6.QtWidgets').QtWidgets.QApplication(sys.argv)
+    app_instance = QApplication.instance() or QApplication(sys.argv)
     
     window = MetadataViewer()
     window.show()
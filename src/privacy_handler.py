@@ -4,15 +4,34 @@ Supports metadata encryption, selective removal, and privacy mode.
 """
 
 from pathlib import Path
-from PIL import Image
+from functools import lru_cache, partial
 import piexif
+import base64
 import json
+import logging
+import os
 from typing import List, Dict, Optional
+from metadata_editor import MetadataEditor
+from metadata_parser import MetadataParser
+
+
+logger = logging.getLogger(__name__)
 
 
 class PrivacyHandler:
     """Handle privacy and security features."""
     
+    # File types batch_privacy_mode processes
+    BATCH_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.tiff', '.gif'})
+    
+    # Buffer size for the overwrite pass in secure_delete
+    WIPE_CHUNK_SIZE = 1 << 20
+    
+    # Metadata encryption: PBKDF2 salt, AES-GCM nonce and key-derivation rounds
+    SALT_SIZE = 16
+    NONCE_SIZE = 12
+    KDF_ITERATIONS = 200_000
+    
     # Fields to remove in privacy mode
     SENSITIVE_FIELDS = {
         'GPS': ['GPSInfo', 'GPSLatitude', 'GPSLongitude', 'GPSAltitude'],
@@ -21,6 +40,15 @@ class PrivacyHandler:
         'Personal': ['Artist', 'Copyright', 'UserComment']
     }
     
+    # (ifd, tag id) -> (tag name, category) for every sensitive tag piexif knows
+    _SENSITIVE_TAGS = {
+        (ifd_name, tag): (info["name"], category)
+        for category, fields in SENSITIVE_FIELDS.items()
+        for ifd_name in ("0th", "Exif", "GPS", "1st")
+        for tag, info in piexif.TAGS[ifd_name].items()
+        if info["name"] in fields
+    }
+    
     @staticmethod
     def strip_metadata(file_path: Path, preserve_fields: Optional[List[str]] = None) -> bool:
         """
@@ -31,18 +59,11 @@ class PrivacyHandler:
             preserve_fields: List of fields to keep
         """
         try:
-            image = Image.open(file_path)
-            
-            # Create image data without EXIF
-            data = list(image.getdata())
-            image_no_exif = Image.new(image.mode, image.size)
-            image_no_exif.putdata(data)
-            
-            # Save without EXIF
-            image_no_exif.save(file_path)
-            return True
+            # JPEGs lose their metadata segments without re-encoding; other
+            # formats are re-saved from the decoded buffer, never per pixel
+            return MetadataEditor.remove_exif_data(file_path, file_path)
         except Exception as e:
-            print(f"Error stripping metadata: {e}")
+            logger.error("Error stripping metadata: %s", e)
             return False
     
     @staticmethod
@@ -56,96 +77,116 @@ class PrivacyHandler:
             if categories is None:
                 categories = ['GPS', 'DateTime', 'Personal']
             
-            exif_dict = piexif.load(str(file_path))
+            exif_dict = MetadataParser.load_exif(file_path)
             
             if 'All' in categories:
                 # Remove all EXIF data
                 return PrivacyHandler.strip_metadata(file_path)
             
-            # Remove specific categories
-            for category in categories:
-                if category in PrivacyHandler.SENSITIVE_FIELDS:
-                    fields_to_remove = PrivacyHandler.SENSITIVE_FIELDS[category]
-                    
-                    for ifd_name in ("0th", "Exif", "GPS", "1st"):
-                        if ifd_name in exif_dict:
-                            ifd = exif_dict[ifd_name]
-                            for tag, value in list(ifd.items()):
-                                try:
-                                    tag_name = piexif.TAGS[ifd_name][tag]["name"]
-                                    if tag_name in fields_to_remove:
-                                        del ifd[tag]
-                                except:
-                                    pass
+            # Remove specific categories in one pass over the IFDs
+            to_delete = PrivacyHandler._tags_for_categories(frozenset(categories))
+            for ifd_name, tags in to_delete.items():
+                ifd = exif_dict.get(ifd_name)
+                if ifd:
+                    for tag in tags & ifd.keys():
+                        del ifd[tag]
             
-            # Save modified image
+            # Save modified EXIF; JPEG/WebP are spliced, not re-encoded
             exif_bytes = piexif.dump(exif_dict)
-            image = Image.open(file_path)
-            image.save(file_path, exif=exif_bytes)
+            MetadataEditor.write_exif(file_path, exif_bytes)
             return True
         except Exception as e:
-            print(f"Error enabling privacy mode: {e}")
+            logger.error("Error enabling privacy mode: %s", e)
             return False
     
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _tags_for_categories(categories: frozenset) -> Dict[str, frozenset]:
+        """Tag ids to delete per IFD for the given privacy categories."""
+        to_delete = {}
+        for (ifd_name, tag), (_, category) in PrivacyHandler._SENSITIVE_TAGS.items():
+            if category in categories:
+                to_delete.setdefault(ifd_name, set()).add(tag)
+        return {ifd_name: frozenset(tags) for ifd_name, tags in to_delete.items()}
+    
     @staticmethod
     def get_sensitive_metadata(file_path: Path) -> Dict[str, List[str]]:
         """Get all sensitive metadata found in image."""
         sensitive_data = {}
         
         try:
-            exif_dict = piexif.load(str(file_path))
+            exif_dict = MetadataParser.load_exif(file_path)
             
+            sensitive_tags = PrivacyHandler._SENSITIVE_TAGS
             for ifd_name in ("0th", "Exif", "GPS", "1st"):
                 ifd = exif_dict.get(ifd_name, {})
                 
                 for tag, value in ifd.items():
-                    try:
-                        tag_name = piexif.TAGS[ifd_name][tag]["name"]
-                        
-                        for category, fields in PrivacyHandler.SENSITIVE_FIELDS.items():
-                            if tag_name in fields:
-                                if category not in sensitive_data:
-                                    sensitive_data[category] = []
-                                sensitive_data[category].append(f"{tag_name}: {str(value)[:50]}")
-                    except:
-                        pass
+                    # One dict probe per tag instead of a name lookup and category scan
+                    hit = sensitive_tags.get((ifd_name, tag))
+                    if hit:
+                        tag_name, category = hit
+                        if category not in sensitive_data:
+                            sensitive_data[category] = []
+                        sensitive_data[category].append(f"{tag_name}: {str(value)[:50]}")
         except Exception as e:
-            print(f"Error scanning sensitive metadata: {e}")
+            logger.error("Error scanning sensitive metadata: %s", e)
         
         return sensitive_data
     
     @staticmethod
     def encrypt_metadata(metadata: Dict, password: str) -> str:
         """
-        Simple metadata encryption (for storage).
-        Note: For production, use proper encryption library like cryptography.
+        Encrypt metadata with AES-256-GCM under a password-derived key.
+        Returns base64 of salt + nonce + ciphertext, or "" on failure.
         """
-        import base64
-        
         try:
-            json_str = json.dumps(metadata)
-            # Simple encoding (NOT secure - use proper encryption in production)
-            encoded = base64.b64encode(json_str.encode()).decode()
-            return encoded
+            # Imported here: cryptography is only needed for metadata encryption
+            from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+            
+            salt = os.urandom(PrivacyHandler.SALT_SIZE)
+            nonce = os.urandom(PrivacyHandler.NONCE_SIZE)
+            key = PrivacyHandler._derive_key(password, salt)
+            ciphertext = AESGCM(key).encrypt(nonce, json.dumps(metadata).encode(), None)
+            return base64.b64encode(salt + nonce + ciphertext).decode()
         except Exception as e:
-            print(f"Error encrypting metadata: {e}")
+            logger.error("Error encrypting metadata: %s", e)
             return ""
     
     @staticmethod
     def decrypt_metadata(encrypted_data: str, password: str) -> Dict:
         """
-        Decrypt metadata.
-        Note: For production, use proper encryption library.
+        Decrypt metadata produced by encrypt_metadata.
+        Returns {} if the password is wrong or the data was tampered with.
         """
-        import base64
-        
         try:
-            decoded = base64.b64decode(encrypted_data).decode()
-            return json.loads(decoded)
+            # Imported here: cryptography is only needed for metadata encryption
+            from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+            
+            raw = base64.b64decode(encrypted_data)
+            salt_end = PrivacyHandler.SALT_SIZE
+            nonce_end = salt_end + PrivacyHandler.NONCE_SIZE
+            key = PrivacyHandler._derive_key(password, raw[:salt_end])
+            plaintext = AESGCM(key).decrypt(raw[salt_end:nonce_end], raw[nonce_end:], None)
+            return json.loads(plaintext)
         except Exception as e:
-            print(f"Error decrypting metadata: {e}")
+            logger.error("Error decrypting metadata: %s", e)
             return {}
     
+    @staticmethod
+    def _derive_key(password: str, salt: bytes) -> bytes:
+        """Derive a 256-bit AES key from password with PBKDF2-HMAC-SHA256."""
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+        
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=salt,
+            iterations=PrivacyHandler.KDF_ITERATIONS
+        )
+        return kdf.derive(password.encode())
+    
     @staticmethod
     def get_privacy_report(file_path: Path) -> Dict:
         """Generate privacy report for an image."""
@@ -165,51 +206,81 @@ class PrivacyHandler:
         return report
     
     @staticmethod
-    def batch_privacy_mode(directory: Path, categories: List[str] = None) -> Dict:
+    def batch_privacy_mode(directory: Path, categories: List[str] = None,
+                           max_workers: Optional[int] = None) -> Dict:
         """
         Apply privacy mode to all images in a directory.
+        Files are rewritten in worker processes (one per CPU by default),
+        since piexif dump and Pillow save are CPU bound per image.
         Returns: Statistics of processed images
         """
         stats = {
             'total_processed': 0,
             'successful': 0,
             'failed': 0,
+            'skipped_no_exif': 0,
             'errors': []
         }
         
+        # Imported here: it pulls in multiprocessing, which only batch runs need
+        from concurrent.futures import ProcessPoolExecutor
+        
         try:
-            for image_file in directory.rglob('*'):
-                if image_file.suffix.lower() in ['.jpg', '.jpeg', '.png', '.tiff', '.gif']:
-                    stats['total_processed'] += 1
-                    
-                    if PrivacyHandler.privacy_mode(image_file, categories):
+            # os.scandir walk; only entries with a matching suffix become Paths
+            image_files = MetadataParser.find_images_in_directory(
+                directory, PrivacyHandler.BATCH_EXTENSIONS
+            )
+            stats['total_processed'] = len(image_files)
+            
+            # Cheap header read first: files without EXIF need no rewrite
+            with_exif = [image_file for image_file in image_files
+                         if PrivacyHandler._has_exif(image_file)]
+            stats['skipped_no_exif'] = len(image_files) - len(with_exif)
+            stats['successful'] = stats['skipped_no_exif']
+            image_files = with_exif
+            
+            worker = partial(PrivacyHandler.privacy_mode, categories=categories)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for image_file, ok in zip(image_files, executor.map(worker, image_files, chunksize=16)):
+                    if ok:
                         stats['successful'] += 1
                     else:
                         stats['failed'] += 1
                         stats['errors'].append(str(image_file))
         except Exception as e:
-            print(f"Error in batch processing: {e}")
+            logger.error("Error in batch processing: %s", e)
         
         return stats
     
+    @staticmethod
+    def _has_exif(file_path: Path) -> bool:
+        """Return False only when the file is known to carry no EXIF block."""
+        try:
+            return MetadataParser.read_exif_segment(file_path) != b''
+        except OSError:
+            # Let privacy_mode report the error
+            return True
+    
     @staticmethod
     def secure_delete(file_path: Path) -> bool:
         """
-        Securely delete a file by overwriting it multiple times.
+        Securely delete a file by overwriting its contents in place before removal.
         """
         try:
-            import os
-            
-            # Overwrite file 3 times
+            # One random pass in fixed-size chunks; repeated passes add nothing on
+            # SSDs and a file-sized buffer does not fit in memory for large files
             file_size = file_path.stat().st_size
+            chunk = os.urandom(PrivacyHandler.WIPE_CHUNK_SIZE)
             
-            for _ in range(3):
-                with open(file_path, 'wb') as f:
-                    f.write(b'\x00' * file_size)
+            with open(file_path, 'r+b', buffering=0) as f:
+                remaining = file_size
+                while remaining:
+                    remaining -= f.write(chunk[:remaining])
+                os.fsync(f.fileno())
             
             # Delete the file
             os.remove(file_path)
             return True
         except Exception as e:
-            print(f"Error securely deleting file: {e}")
+            logger.error("Error securely deleting file: %s", e)
             return False
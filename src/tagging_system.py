@@ -3,133 +3,312 @@ Advanced tagging system for image metadata.
 Supports custom tags, hierarchical structure, and tag suggestions.
 """
 
+import atexit
+import bisect
+import hashlib
+import heapq
 import json
+import logging
+import os
+import sys
+import threading
+import weakref
 from pathlib import Path
 from typing import Dict, List, Set, Optional
-from collections import Counter
+from collections import Counter, deque
+from datetime import datetime
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json is used without it
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+
+def _flush_if_alive(flush_ref):
+    """Exit hook: flush a TaggingSystem that has not been garbage-collected."""
+    flush = flush_ref()
+    if flush is not None:
+        flush()
 
 
 class TaggingSystem:
     """Manage custom tags and tagging for images."""
     
+    # Seconds to wait after a change so a burst of edits is written once
+    SAVE_DELAY = 0.5
+    
+    # Most recent history entries kept (in memory and on disk)
+    HISTORY_LIMIT = 1000
+    
+    # Number of autocomplete suggestions returned
+    SUGGESTION_LIMIT = 10
+    
     def __init__(self, tags_db_path: Optional[Path] = None):
         """Initialize tagging system with optional persistent storage."""
         self.tags_db_path = tags_db_path or Path.home() / '.metadata_expert' / 'tags.json'
         self.tags_db_path.parent.mkdir(parents=True, exist_ok=True)
         self.tags_hierarchy = {}
+        # image -> {tag: None}: an insertion-ordered set, so membership is O(1)
         self.image_tags = {}
-        self.tag_history = []
+        self.tag_history = deque(maxlen=self.HISTORY_LIMIT)
+        # Sorted (lowercase, tag) pairs: prefix suggestions are a bisect plus a short slice
+        self._tag_names = []
+        # Images per tag, kept current on every add/remove
+        self._tag_counts = Counter()
+        # get_tag_cloud results per limit; cleared whenever _tag_counts changes
+        self._cloud_cache = {}
+        # Reverse index tag -> images carrying it (dict keys keep tagging order)
+        self._tag_images = {}
+        # tag -> {category: hierarchy entry}, so count updates skip the category scan
+        self._tag_entries = {}
+        
+        # Deferred saving: mutations mark the DB dirty and a timer writes it once
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._save_timer = None
+        # Digest of the bytes last read or written, so unchanged saves skip the disk
+        self._saved_digest = None
         self.load_tags_db()
+        # Weak reference, so the exit hook does not keep every instance alive
+        atexit.register(_flush_if_alive, weakref.WeakMethod(self.flush))
     
     def load_tags_db(self):
         """Load tags database from file."""
         try:
             if self.tags_db_path.exists():
-                with open(self.tags_db_path, 'r') as f:
-                    data = json.load(f)
+                with open(self.tags_db_path, 'rb') as f:
+                    raw = f.read()
+                    data = self._decode(raw)
+                    self._saved_digest = hashlib.blake2b(raw).digest()
                     self.tags_hierarchy = data.get('hierarchy', {})
-                    self.image_tags = data.get('image_tags', {})
-                    self.tag_history = data.get('history', [])
+                    self.image_tags = self._image_tag_sets(data.get('image_tags', {}))
+                    self.tag_history = deque(data.get('history', []), maxlen=self.HISTORY_LIMIT)
         except Exception as e:
-            print(f"Error loading tags database: {e}")
+            logger.error("Error loading tags database: %s", e)
+        self._rebuild_indexes()
     
-    def save_tags_db(self):
-        """Save tags database to file."""
-        try:
-            data = {
-                'hierarchy': self.tags_hierarchy,
-                'image_tags': self.image_tags,
-                'history': self.tag_history[-1000:]  # Keep last 1000 entries
-            }
-            with open(self.tags_db_path, 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"Error saving tags database: {e}")
+    def _rebuild_indexes(self):
+        """Rebuild the lookup structures derived from the hierarchy and image tags."""
+        self._tag_names = sorted({
+            (tag.lower(), tag)
+            for tags in self.tags_hierarchy.values()
+            for tag in tags
+        })
+        self._tag_entries = {}
+        for category, tags in self.tags_hierarchy.items():
+            for tag, entry in tags.items():
+                self._tag_entries.setdefault(tag, {})[category] = entry
+        self._tag_counts = Counter(tag for tags in self.image_tags.values() for tag in tags)
+        self._cloud_cache = {}
+        self._tag_images = {}
+        for image_key, tags in self.image_tags.items():
+            for tag in tags:
+                self._tag_images.setdefault(tag, {})[image_key] = None
+    
+    def save_tags_db(self) -> bool:
+        """
+        Save tags database to file, replacing it atomically.
+        State is copied under the lock and encoded and written outside it,
+        so tagging does not wait on the disk.
+        """
+        # One writer at a time, so an older snapshot never lands after a newer one
+        with self._write_lock:
+            with self._lock:
+                data = {
+                    'hierarchy': {category: dict(tags) for category, tags in self.tags_hierarchy.items()},
+                    'image_tags': self._image_tag_lists(),
+                    'history': list(self.tag_history)
+                }
+                self._dirty = False
+            
+            try:
+                payload = self._encode(data)
+                digest = hashlib.blake2b(payload).digest()
+                if digest != self._saved_digest or not self.tags_db_path.exists():
+                    tmp_path = self.tags_db_path.with_name(self.tags_db_path.name + '.tmp')
+                    with open(tmp_path, 'wb') as f:
+                        f.write(payload)
+                    os.replace(tmp_path, self.tags_db_path)
+                    self._saved_digest = digest
+                return True
+            except Exception as e:
+                logger.error("Error saving tags database: %s", e)
+                with self._lock:
+                    self._dirty = True
+                return False
+    
+    @staticmethod
+    def _image_tag_sets(image_tags: Dict[str, List[str]]) -> Dict[str, Dict[str, None]]:
+        """Convert the JSON form (image -> tag list) to the in-memory ordered sets."""
+        # Interned so each path and tag name is one shared string across all indexes
+        intern = sys.intern
+        return {
+            intern(image_key): dict.fromkeys(map(intern, tags))
+            for image_key, tags in image_tags.items()
+        }
+    
+    def _image_tag_lists(self) -> Dict[str, List[str]]:
+        """Convert image_tags back to the JSON form (image -> tag list)."""
+        return {image_key: list(tags) for image_key, tags in self.image_tags.items()}
+    
+    @staticmethod
+    def _encode(data: Dict, indent: bool = False) -> bytes:
+        """
+        Serialize to JSON in one buffer, with orjson when it is installed.
+        Compact unless indent is set; only exports are meant to be read by people.
+        """
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+        if indent:
+            return json.dumps(data, indent=2).encode()
+        return json.dumps(data, separators=(',', ':')).encode()
+    
+    @staticmethod
+    def _decode(raw: bytes) -> Dict:
+        """Parse JSON bytes, with orjson when it is installed."""
+        if orjson is not None:
+            return orjson.loads(raw)
+        return json.loads(raw)
+    
+    def flush(self):
+        """Write pending changes now instead of waiting for the save timer."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            dirty = self._dirty
+        if dirty:
+            self.save_tags_db()
+    
+    def _schedule_save(self):
+        """Mark the DB dirty and arm the save timer if it is not already running."""
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
     
     def add_tag(self, tag: str, category: str = 'General', description: str = ''):
         """Add a new tag to the hierarchy."""
-        if category not in self.tags_hierarchy:
-            self.tags_hierarchy[category] = {}
+        tag = sys.intern(tag)
         
-        self.tags_hierarchy[category][tag] = {
-            'description': description,
-            'count': 0,
-            'created': str(Path.ctime(Path.cwd()))
-        }
-        self.save_tags_db()
+        with self._lock:
+            if category not in self.tags_hierarchy:
+                self.tags_hierarchy[category] = {}
+            
+            entry = self.tags_hierarchy[category][tag] = {
+                'description': description,
+                'count': 0,
+                'created': datetime.now().isoformat(timespec='seconds')
+            }
+            self._tag_entries.setdefault(tag, {})[category] = entry
+            
+            key = (tag.lower(), tag)
+            index = bisect.bisect_left(self._tag_names, key)
+            if index == len(self._tag_names) or self._tag_names[index] != key:
+                self._tag_names.insert(index, key)
+            self._schedule_save()
     
     def add_tag_to_image(self, image_path: str, tag: str):
         """Add a tag to an image."""
-        image_key = str(image_path)
+        image_key = sys.intern(str(image_path))
+        tag = sys.intern(tag)
         
-        if image_key not in self.image_tags:
-            self.image_tags[image_key] = []
-        
-        if tag not in self.image_tags[image_key]:
-            self.image_tags[image_key].append(tag)
-            self._update_tag_count(tag)
-            self.tag_history.append({
-                'action': 'add_tag',
-                'image': image_key,
-                'tag': tag,
-                'timestamp': str(Path.ctime(Path.cwd()))
-            })
-            self.save_tags_db()
+        with self._lock:
+            tags = self.image_tags.setdefault(image_key, {})
+            
+            if tag not in tags:
+                tags[tag] = None
+                self._tag_counts[tag] += 1
+                self._cloud_cache.clear()
+                self._tag_images.setdefault(tag, {})[image_key] = None
+                self._update_tag_count(tag)
+                self.tag_history.append({
+                    'action': 'add_tag',
+                    'image': image_key,
+                    'tag': tag,
+                    'timestamp': datetime.now().isoformat(timespec='seconds')
+                })
+                self._schedule_save()
     
     def remove_tag_from_image(self, image_path: str, tag: str):
         """Remove a tag from an image."""
         image_key = str(image_path)
         
-        if image_key in self.image_tags and tag in self.image_tags[image_key]:
-            self.image_tags[image_key].remove(tag)
-            self.tag_history.append({
-                'action': 'remove_tag',
-                'image': image_key,
-                'tag': tag,
-                'timestamp': str(Path.ctime(Path.cwd()))
-            })
-            self.save_tags_db()
+        with self._lock:
+            tags = self.image_tags.get(image_key)
+            if tags is not None and tag in tags:
+                del tags[tag]
+                self._tag_counts[tag] -= 1
+                if self._tag_counts[tag] <= 0:
+                    del self._tag_counts[tag]
+                self._cloud_cache.clear()
+                images = self._tag_images.get(tag)
+                if images is not None:
+                    images.pop(image_key, None)
+                    if not images:
+                        del self._tag_images[tag]
+                self.tag_history.append({
+                    'action': 'remove_tag',
+                    'image': image_key,
+                    'tag': tag,
+                    'timestamp': datetime.now().isoformat(timespec='seconds')
+                })
+                self._schedule_save()
     
     def get_image_tags(self, image_path: str) -> List[str]:
         """Get all tags for an image."""
-        return self.image_tags.get(str(image_path), [])
+        return list(self.image_tags.get(str(image_path), ()))
     
     def get_tag_suggestions(self, partial_tag: str) -> List[str]:
-        """Get autocomplete suggestions for tags."""
-        suggestions = []
+        """
+        Get autocomplete suggestions for tags (case-insensitive).
+        Tags starting with partial_tag come first, most used first; tags that
+        only contain it elsewhere fill any remaining places, ranked the same way.
+        Ties keep alphabetical order.
+        """
         partial_lower = partial_tag.lower()
+        names = self._tag_names
+        limit = self.SUGGESTION_LIMIT
         
-        for category, tags in self.tags_hierarchy.items():
-            for tag in tags.keys():
-                if partial_lower in tag.lower():
-                    suggestions.append(tag)
+        # Tags starting with the input are contiguous in the sorted index
+        start = bisect.bisect_left(names, (partial_lower,))
+        end = start
+        while end < len(names) and names[end][0].startswith(partial_lower):
+            end += 1
         
-        # Sort by frequency
-        suggestions.sort(key=lambda t: self._get_tag_count(t), reverse=True)
-        return suggestions[:10]  # Return top 10
+        # Most frequent first; a bounded heap instead of sorting every match
+        suggestions = heapq.nlargest(
+            limit, (tag for _, tag in names[start:end]), key=self._get_tag_count
+        )
+        
+        # Only scan for matches inside a tag when prefixes do not fill the list
+        if len(suggestions) < limit:
+            infix = (tag for lower, tag in names
+                     if partial_lower in lower and not lower.startswith(partial_lower))
+            suggestions.extend(heapq.nlargest(limit - len(suggestions), infix, key=self._get_tag_count))
+        return suggestions
     
     def get_tag_cloud(self, limit: int = 50) -> Dict[str, int]:
         """Get tag cloud with frequency."""
-        tag_counts = Counter()
-        
-        for tags in self.image_tags.values():
-            for tag in tags:
-                tag_counts[tag] += 1
-        
-        return dict(tag_counts.most_common(limit))
+        cloud = self._cloud_cache.get(limit)
+        if cloud is None:
+            cloud = self._cloud_cache[limit] = self._tag_counts.most_common(limit)
+        return dict(cloud)
     
     def find_images_by_tag(self, tag: str) -> List[str]:
         """Find all images with a specific tag."""
-        images = []
-        for image_path, tags in self.image_tags.items():
-            if tag in tags:
-                images.append(image_path)
-        return images
+        return list(self._tag_images.get(tag, ()))
     
     def get_tag_statistics(self) -> Dict:
         """Get tagging statistics."""
-        total_tags = sum(len(tags) for tags in self.image_tags.values())
-        unique_tags = len(set(tag for tags in self.image_tags.values() for tag in tags))
+        total_tags = sum(self._tag_counts.values())
+        unique_tags = len(self._tag_counts)
         
         return {
             'total_images_tagged': len(self.image_tags),
@@ -141,39 +320,37 @@ class TaggingSystem:
     
     def _update_tag_count(self, tag: str):
         """Update tag count in hierarchy."""
-        for category_tags in self.tags_hierarchy.values():
-            if tag in category_tags:
-                category_tags[tag]['count'] = category_tags[tag].get('count', 0) + 1
+        for entry in self._tag_entries.get(tag, {}).values():
+            entry['count'] = entry.get('count', 0) + 1
     
     def _get_tag_count(self, tag: str) -> int:
-        """Get count for a tag."""
-        for category_tags in self.tags_hierarchy.values():
-            if tag in category_tags:
-                return category_tags[tag].get('count', 0)
-        return 0
+        """Get the number of images currently carrying a tag."""
+        return self._tag_counts[tag]
     
     def export_tags_to_json(self, export_path: Path) -> bool:
         """Export tags to JSON file."""
         try:
-            with open(export_path, 'w') as f:
-                json.dump({
+            with open(export_path, 'wb') as f:
+                f.write(self._encode({
                     'hierarchy': self.tags_hierarchy,
-                    'image_tags': self.image_tags,
-                }, f, indent=2)
+                    'image_tags': self._image_tag_lists(),
+                }, indent=True))
             return True
         except Exception as e:
-            print(f"Error exporting tags: {e}")
+            logger.error("Error exporting tags: %s", e)
             return False
     
     def import_tags_from_json(self, import_path: Path) -> bool:
         """Import tags from JSON file."""
         try:
-            with open(import_path, 'r') as f:
-                data = json.load(f)
+            with open(import_path, 'rb') as f:
+                data = self._decode(f.read())
+            with self._lock:
                 self.tags_hierarchy.update(data.get('hierarchy', {}))
-                self.image_tags.update(data.get('image_tags', {}))
-                self.save_tags_db()
+                self.image_tags.update(self._image_tag_sets(data.get('image_tags', {})))
+                self._rebuild_indexes()
+                self._schedule_save()
             return True
         except Exception as e:
-            print(f"Error importing tags: {e}")
+            logger.error("Error importing tags: %s", e)
             return False
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Modules in src/ import each other as top-level modules, as main.py sets up
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
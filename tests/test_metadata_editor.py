@@ -0,0 +1,39 @@
+"""Tests for MetadataEditor."""
+
+import piexif
+from PIL import Image
+
+from metadata_editor import MetadataEditor
+
+
+def _save_mpo_with_gps(path):
+    """Save a 2-frame MPO carrying Make and GPS EXIF in every frame."""
+    exif_bytes = piexif.dump({
+        '0th': {piexif.ImageIFD.Make: b'SecretCam'},
+        'GPS': {
+            piexif.GPSIFD.GPSLatitudeRef: b'N',
+            piexif.GPSIFD.GPSLatitude: ((40, 1), (26, 1), (46, 1)),
+        },
+    })
+    first = Image.new('RGB', (64, 48), 'red')
+    second = Image.new('RGB', (64, 48), 'blue')
+    first.save(path, 'MPO', save_all=True, append_images=[second], exif=exif_bytes)
+
+
+def test_remove_exif_data_drops_later_mpo_frames(tmp_path):
+    src = tmp_path / 'stereo.jpg'
+    dst = tmp_path / 'clean.jpg'
+    _save_mpo_with_gps(src)
+    with Image.open(src) as image:
+        assert image.n_frames == 2
+    
+    assert MetadataEditor.remove_exif_data(src, dst)
+    
+    data = dst.read_bytes()
+    assert b'Exif\x00\x00' not in data
+    assert b'SecretCam' not in data
+    assert b'MPF\x00' not in data
+    with Image.open(dst) as image:
+        assert image.format == 'JPEG'
+        assert getattr(image, 'n_frames', 1) == 1
+        assert image.size == (64, 48)